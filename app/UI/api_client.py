@@ -0,0 +1,174 @@
+"""
+HTTP client for the issue tracker API, shared by the Streamlit pages.
+
+One pooled requests.Session per Streamlit server process
+(st.cache_resource). It has timeouts on every call and retries with backoff
+for connection failures and 502/503/504 on reads. POST/PUT go through the
+agent and are not replayed after the request has been sent. Parameters are
+passed via `params`, so natural-language queries are URL-encoded.
+
+Read results are cached with st.cache_data for a short TTL and cleared
+after every mutation made through this module.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = os.getenv("ISSUE_API_URL", "http://127.0.0.1:8000/api/issues")
+
+# Filter values accepted by the API
+STATUSES = ["open", "in_progress", "closed"]
+PRIORITIES = ["high", "medium", "low"]
+
+# (connect, read) seconds; NL create/update wait for the model
+TIMEOUT = (3.05, 15)
+AGENT_TIMEOUT = (3.05, 120)
+
+STATS_TTL = 30
+PAGE_TTL = 60
+# Reruns within this window reuse the last change-feed answer
+EVENTS_TTL = 2
+
+
+class ApiError(Exception):
+    """The API answered with an error; `detail` is the server's message"""
+
+    def __init__(self, status_code, detail):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        # Status/read retries only for reads; connect errors are retried for any method
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _check(response: requests.Response) -> requests.Response:
+    if response.status_code >= 400:
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise ApiError(response.status_code, detail)
+    return response
+
+
+def request(method: str, path: str, timeout=TIMEOUT, **kwargs) -> requests.Response:
+    return _check(get_session().request(method, f"{API_URL}{path}", timeout=timeout, **kwargs))
+
+
+# url -> (ETag, body) of the last 200, for conditional GETs
+_etags = OrderedDict()
+_etags_lock = threading.Lock()
+_ETAGS_MAX = 256
+
+
+def get_json(path: str, params=None):
+    """GET with If-None-Match, reusing the last body on 304 Not Modified"""
+    url = requests.Request("GET", f"{API_URL}{path}", params=params).prepare().url
+    with _etags_lock:
+        cached = _etags.get(url)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = get_session().get(url, headers=headers, timeout=TIMEOUT)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    body = _check(response).json()
+    if response.headers.get("ETag"):
+        with _etags_lock:
+            _etags[url] = (response.headers["ETag"], body)
+            _etags.move_to_end(url)
+            while len(_etags) > _ETAGS_MAX:
+                _etags.popitem(last=False)
+    return body
+
+
+def list_issues(limit: int = 100):
+    """(issues, change-feed offset the list reflects)"""
+    response = request("GET", "/issues", params={"skip": 0, "limit": limit})
+    return response.json(), response.headers.get("X-Event-Offset")
+
+
+@st.cache_data(ttl=EVENTS_TTL, show_spinner=False)
+def events_since(offset: str):
+    """Change feed after `offset`, or None when it can no longer resume (410)"""
+    try:
+        return request("GET", "/events/since", params={"after": offset}).json()
+    except ApiError as e:
+        if e.status_code == 410:
+            return None
+        raise
+
+
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
+def fetch_stats(offset: str):
+    """Server-side counts; `offset` keys the cache so it turns over when issues change"""
+    return get_json("/stats")
+
+
+@st.cache_data(ttl=PAGE_TTL, max_entries=256, show_spinner=False)
+def fetch_page(offset: str, limit: int, sort: str, order: str, statuses=(), priorities=(), tags=(), cursor=None):
+    """
+    One page of GET /issues and the cursor of the next one (None on the last
+    page). `offset` keys the cache so pages are refetched once issues change.
+    """
+    params = {"limit": limit, "sort": sort, "order": order,
+              "status": list(statuses), "priority": list(priorities), "tag": list(tags)}
+    if cursor:
+        params["cursor"] = cursor
+    response = request("GET", "/issues", params=params)
+    return response.json(), response.headers.get("X-Next-Cursor")
+
+
+def invalidate():
+    """Drop cached reads after a mutation"""
+    events_since.clear()
+    fetch_stats.clear()
+    fetch_page.clear()
+
+
+def create_issue(query: str):
+    try:
+        return request("POST", "/issues", params={"query": query}, timeout=AGENT_TIMEOUT).json()
+    finally:
+        invalidate()
+
+
+def update_issue(query: str):
+    try:
+        return request("PUT", "/issue/", params={"query": query}, timeout=AGENT_TIMEOUT).json()
+    finally:
+        invalidate()
+
+
+def patch_issue(issue_id: int, changes: dict):
+    """Structured partial update (no agent call)"""
+    try:
+        return request("PATCH", f"/issues/{issue_id}", json=changes).json()
+    finally:
+        invalidate()
+
+
+def delete_issue(issue_id: int):
+    try:
+        request("DELETE", f"/issues/{issue_id}")
+    finally:
+        invalidate()
@@ -2,13 +2,18 @@
 Agentic Issue Tracker - Streamlit Version
 AI-Powered Issue Management System
 """
-import requests
 import streamlit as st
+import requests
 import json
 import uuid
 from datetime import datetime, timedelta
 import time
-from urllib.parse import quote
+from collections import Counter
+
+from api_client import (
+    ApiError, STATUSES, PRIORITIES, list_issues, events_since, fetch_stats, fetch_page,
+    create_issue, update_issue, patch_issue, delete_issue
+)
 
 # Page config
 st.set_page_config(
@@ -133,25 +138,110 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def fetch_issues():
-    response = requests.get("http://127.0.0.1:8000/api/issues/issues?skip=0&limit=100")
-    response.raise_for_status()
-    return response.json()
+# Seconds between checks of the server's change feed
+LIVE_REFRESH_SECONDS = 5
+
+def load_issues():
+    """(Re)load the issue list and remember the change-feed position it reflects"""
+    st.session_state.issues, st.session_state.event_offset = list_issues()
+
+def apply_events(events):
+    """Apply created/updated/deleted events to the local issue list"""
+    issues = st.session_state.issues
+    for event in events:
+        if event['type'] == 'reset':
+            load_issues()
+            return
+        index = next((n for n, i in enumerate(issues) if i['issue_id'] == event['issue_id']), None)
+        if event['type'] == 'deleted':
+            if index is not None:
+                del issues[index]
+        elif index is not None:
+            issues[index] = event['issue']
+        elif event['type'] == 'created':
+            issues.insert(0, event['issue'])
+
+def sync_issues():
+    """Catch up with changes since the last sync; returns True if anything changed"""
+    offset = st.session_state.get('event_offset')
+    if not offset:
+        load_issues()
+        return True
+    feed = events_since(offset)
+    if feed is None:
+        # Too far behind (or the server restarted): start over from a fresh list
+        load_issues()
+        return True
+    apply_events(feed['events'])
+    st.session_state.event_offset = feed['offset']
+    return bool(feed['events'])
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_updates():
+    if sync_issues():
+        st.rerun()
+
+def loaded_stats(issues):
+    """Status and priority counts of the loaded issues, when the server cannot give totals"""
+    return {
+        'total': len(issues),
+        'by_status': dict(Counter(issue['status'] for issue in issues)),
+        'by_priority': dict(Counter(issue['priority'] for issue in issues)),
+    }
 
-def create_issue(query:str):
-    response = requests.post(f"http://127.0.0.1:8000/api/issues/issues?query={query}")
-    response.raise_for_status()
-    return response.json()
+def apply_overrides(issues):
+    """Issues with quick actions the server has not confirmed yet applied; deleted ones dropped"""
+    overrides = st.session_state.get('overrides')
+    if not overrides:
+        return issues
+    return [
+        {**issue, **overrides[issue['issue_id']]} if issue['issue_id'] in overrides else issue
+        for issue in issues
+        if overrides.get(issue['issue_id'], {}) is not None
+    ]
 
-def update_issue(query:str):
-    response = requests.put(f"http://127.0.0.1:8000/api/issues/issue?query={query}")
-    response.raise_for_status()
-    return response.json()
+def queue_action(issue_id, changes, message):
+    """
+    Show a quick action right away and rerun; run_pending_actions() sends it
+    once the page has been redrawn. changes=None deletes the issue.
+    """
+    overrides = st.session_state.setdefault('overrides', {})
+    overrides[issue_id] = None if changes is None else {**(overrides.get(issue_id) or {}), **changes}
+    st.session_state.setdefault('pending_actions', []).append((issue_id, changes, message))
+    st.rerun()
+
+def run_pending_actions():
+    """Send queued quick actions (one PATCH or DELETE each), undoing any that fail"""
+    actions = st.session_state.get('pending_actions')
+    if not actions:
+        return
+    st.session_state.pending_actions = []
+    for n, (issue_id, changes, message) in enumerate(actions):
+        try:
+            if changes is None:
+                delete_issue(issue_id)
+            else:
+                patch_issue(issue_id, changes)
+            st.session_state.flash = ('success', message)
+        except ApiError as e:
+            st.session_state.flash = ('error', f"❌ Issue #{issue_id}: {e.detail} (change undone)")
+        except requests.RequestException:
+            # Writes are not retried: stop here and undo this action and the ones not sent
+            for unsent_id, _, _ in actions[n + 1:]:
+                st.session_state.overrides.pop(unsent_id, None)
+            st.session_state.flash = (
+                'error', f"❌ Could not reach the API; {len(actions) - n} change(s) undone, please retry"
+            )
+            break
+        finally:
+            # Confirmed changes come back from the refreshed page, failed ones are dropped
+            st.session_state.overrides.pop(issue_id, None)
+    st.rerun()
 
 
 # Initialize session state
 if 'issues' not in st.session_state:
-    st.session_state.issues = fetch_issues()
+    load_issues()
 
     # st.session_state.issues = [
     #     {
@@ -278,6 +368,9 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+    # Pulls server changes into st.session_state.issues instead of re-downloading the list
+    live_updates()
+
     # Sidebar navigation
     st.sidebar.title("🎯 Navigation")
     page = st.sidebar.radio(
@@ -287,30 +380,38 @@ def main():
     )
 
     st.sidebar.markdown("---")
-    st.sidebar.markdown(f"**Total Issues:** {len(st.session_state.issues)}")
-
-    # Count by status
-    status_counts = {}
-    for issue in st.session_state.issues:
-        status = issue['status']
-        status_counts[status] = status_counts.get(status, 0) + 1
+    # Counts come from the server so they cover every issue, not just the loaded page
+    try:
+        stats = fetch_stats(st.session_state.event_offset)
+        st.sidebar.markdown(f"**Total Issues:** {stats['total']}")
+    except ApiError:
+        # /stats needs the SQL backend (501 with ISSUE_BACKEND=memory/file)
+        stats = loaded_stats(st.session_state.issues)
+        st.sidebar.markdown(f"**Loaded Issues:** {stats['total']}")
 
     st.sidebar.markdown("**By Status:**")
-    for status, count in status_counts.items():
+    for status, count in stats['by_status'].items():
         st.sidebar.markdown(f"• {status.replace('_', ' ').title()}: {count}")
 
-    # Count by priority
-    priority_counts = {}
-    for issue in st.session_state.issues:
-        priority = issue['priority']
-        priority_counts[priority] = priority_counts.get(priority, 0) + 1
-
     st.sidebar.markdown("**By Priority:**")
     for priority in ['urgent', 'high', 'medium', 'low']:
-        count = priority_counts.get(priority, 0)
+        count = stats['by_priority'].get(priority, 0)
         if count > 0:
             st.sidebar.markdown(f"• {priority.title()}: {count}")
 
+    if 'open_age' in stats:
+        st.sidebar.markdown("**Open Issue Age:**")
+        age_labels = {'lt_1d': '< 1 day', '1d_7d': '1-7 days', '7d_30d': '7-30 days', 'gt_30d': '> 30 days'}
+        for bucket, label in age_labels.items():
+            st.sidebar.markdown(f"• {label}: {stats['open_age'].get(bucket, 0)}")
+
+        st.sidebar.markdown(f"**Estimated Effort:** {stats['estimated_minutes_total'] / 60:.1f}h")
+
+    flash = st.session_state.pop('flash', None)
+    if flash:
+        kind, message = flash
+        (st.success if kind == 'success' else st.error)(message)
+
     # Page content
     if page == "📋 Issues":
         show_issues_page()
@@ -319,111 +420,207 @@ def main():
     elif page == "💬 Chat Updater":
         show_chat_updater_page()
 
+    # Quick actions queued during this run are sent after the page is drawn
+    run_pending_actions()
+
+
+def render_issue_card(issue):
+    """Full card for one issue, with quick-action buttons"""
+    with st.container():
+        col1, col2 = st.columns([8, 2])
+
+        with col1:
+            # Title and status
+            st.markdown(f"### {get_status_icon(issue['status'])} {issue['title']}")
+            st.markdown(f"<small>Issue #{issue['issue_id']} • {issue['created_at']}</small>", unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(get_priority_badge(issue['priority']), unsafe_allow_html=True)
+
+        # Description
+        st.markdown(f"**Description:** {issue['description']}")
+
+        # Tags
+        tags_html = " ".join([f'<span class="tag-badge">🏷️ {tag}</span>' for tag in issue['tags']])
+        st.markdown(tags_html, unsafe_allow_html=True)
+
+        # Metadata
+        col2, col3 = st.columns(2)
+        # with col1:
+        #     st.markdown(f"⏱️ **Estimated:** {issue['estimated_time']}")
+        with col2:
+            st.markdown(f"📊 **Status:** {issue['status'].replace('_', ' ').title()}")
+        with col3:
+            st.markdown(f"🎯 **Priority:** {issue['priority'].title()}")
+
+        # Root cause hint (if available)
+        if issue.get('root_cause_hint'):
+            st.markdown(f"""
+            <div class="ai-hint">
+                <strong>🤖 AI Root Cause Analysis</strong><br/>
+                {issue['root_cause_hint']}
+            </div>
+            """, unsafe_allow_html=True)
+
+        # Quick actions: one PATCH/DELETE each, shown before the server confirms
+        issue_id = issue['issue_id']
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            with st.popover(f"Edit #{issue_id}"):
+                render_edit_form(issue)
+        with col2:
+            if st.button(f"Start #{issue_id}", key=f"start_{issue_id}", disabled=issue['status'] != 'open'):
+                queue_action(issue_id, {'status': 'in_progress'}, f"Issue #{issue_id} is in progress")
+        with col3:
+            if issue['status'] == 'closed':
+                if st.button(f"Reopen #{issue_id}", key=f"reopen_{issue_id}"):
+                    queue_action(issue_id, {'status': 'open'}, f"Issue #{issue_id} reopened")
+            elif st.button(f"Close #{issue_id}", key=f"close_{issue_id}"):
+                queue_action(issue_id, {'status': 'closed'}, f"Issue #{issue_id} closed!")
+        with col4:
+            if st.button(f"Delete #{issue_id}", key=f"delete_{issue_id}"):
+                queue_action(issue_id, None, f"Issue #{issue_id} deleted!")
+
+        st.markdown("---")
+
+
+def render_edit_form(issue):
+    """Edit form for the structured fields; only changed fields are sent"""
+    issue_id = issue['issue_id']
+    with st.form(key=f"edit_form_{issue_id}"):
+        title = st.text_input("Title", value=issue['title'])
+        priority = st.selectbox("Priority", PRIORITIES,
+                                index=PRIORITIES.index(issue['priority']) if issue['priority'] in PRIORITIES else 0)
+        status = st.selectbox("Status", STATUSES,
+                              index=STATUSES.index(issue['status']) if issue['status'] in STATUSES else 0)
+        tags = st.text_input("Tags (comma separated)", value=", ".join(issue['tags']))
+        if st.form_submit_button("Save"):
+            edited = {
+                'title': title.strip(),
+                'priority': priority,
+                'status': status,
+                'tags': [t.strip() for t in tags.split(',') if t.strip()],
+            }
+            changes = {field: value for field, value in edited.items() if value != issue[field]}
+            if changes:
+                queue_action(issue_id, changes, f"Issue #{issue_id} updated!")
+
+
+# Sort choices mapped to the API's keyset sorts (sort, order)
+SORT_OPTIONS = {
+    'Created (newest)': ('created', 'desc'),
+    'Created (oldest)': ('created', 'asc'),
+    'Recently updated': ('updated', 'desc'),
+    'Issue #': ('id', 'asc'),
+}
+
 
 def show_issues_page():
-    """Display all issues"""
+    """Display one server-side page of issues at a time"""
     st.header("📋 All Issues")
 
     # Filters
-    col1, col2, col3 = st.columns([2, 2, 1])
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 2])
 
     with col1:
         status_filter = st.multiselect(
             "Filter by Status",
-            options=['open', 'in_progress', 'resolved', 'closed'],
+            options=STATUSES,
             default=['open', 'in_progress']
         )
 
     with col2:
         priority_filter = st.multiselect(
             "Filter by Priority",
-            options=['urgent', 'high', 'medium', 'low'],
-            default=['urgent', 'high', 'medium', 'low']
+            options=PRIORITIES,
+            default=PRIORITIES
         )
 
     with col3:
-        sort_by = st.selectbox(
-            "Sort by",
-            options=['Created (newest)', 'Created (oldest)', 'Priority', 'Status']
-        )
+        tag_input = st.text_input("Tags (comma separated)", placeholder="bug, backend")
 
-    st.markdown("---")
+    with col4:
+        sort_by = st.selectbox("Sort by", options=list(SORT_OPTIONS))
 
-    # Filter issues
-    filtered_issues = [
-        issue for issue in st.session_state.issues
-        if issue['status'] in status_filter and issue['priority'] in priority_filter
-    ]
+    col1, col2 = st.columns([2, 2])
+    with col1:
+        view = st.radio("View", ['Cards', 'Table'], horizontal=True)
+    with col2:
+        page_sizes = [10, 25, 50] if view == 'Cards' else [50, 100, 250, 500]
+        page_size = st.selectbox("Per page", options=page_sizes)
 
-    # Sort issues
-    if sort_by == 'Priority':
-        priority_order = {'urgent': 0, 'high': 1, 'medium': 2, 'low': 3}
-        filtered_issues.sort(key=lambda x: priority_order.get(x['priority'], 4))
+    st.markdown("---")
 
-    if not filtered_issues:
+    if not status_filter or not priority_filter:
         st.info("No issues match the selected filters.")
         return
 
-    # Display issues
-    for issue in filtered_issues:
-        with st.container():
-            col1, col2 = st.columns([8, 2])
-
-            with col1:
-                # Title and status
-                st.markdown(f"### {get_status_icon(issue['status'])} {issue['title']}")
-                st.markdown(f"<small>Issue #{issue['issue_id']} • {issue['created_at']}</small>", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(get_priority_badge(issue['priority']), unsafe_allow_html=True)
-
-            # Description
-            st.markdown(f"**Description:** {issue['description']}")
-
-            # Tags
-            tags_html = " ".join([f'<span class="tag-badge">🏷️ {tag}</span>' for tag in issue['tags']])
-            st.markdown(tags_html, unsafe_allow_html=True)
-
-            # Metadata
-            col2, col3 = st.columns(2)
-            # with col1:
-            #     st.markdown(f"⏱️ **Estimated:** {issue['estimated_time']}")
-            with col2:
-                st.markdown(f"📊 **Status:** {issue['status'].replace('_', ' ').title()}")
-            with col3:
-                st.markdown(f"🎯 **Priority:** {issue['priority'].title()}")
-
-            # Root cause hint (if available)
-            if issue.get('root_cause_hint'):
-                st.markdown(f"""
-                <div class="ai-hint">
-                    <strong>🤖 AI Root Cause Analysis</strong><br/>
-                    {issue['root_cause_hint']}
-                </div>
-                """, unsafe_allow_html=True)
+    sort, order = SORT_OPTIONS[sort_by]
+    tags = tuple(t.strip() for t in tag_input.split(',') if t.strip())
+    # Selecting every value is the same as not filtering, and lets the API skip the predicate
+    statuses = tuple(status_filter) if len(status_filter) < len(STATUSES) else ()
+    priorities = tuple(priority_filter) if len(priority_filter) < len(PRIORITIES) else ()
+
+    # Cursors of the pages visited so far; start over whenever the query changes
+    query = (statuses, priorities, tags, sort, order, page_size)
+    if st.session_state.get('page_query') != query:
+        st.session_state.page_query = query
+        st.session_state.page_cursors = [None]
+    cursors = st.session_state.page_cursors
+
+    try:
+        issues, next_cursor = fetch_page(
+            st.session_state.event_offset, page_size, sort, order,
+            statuses, priorities, tags, cursors[-1]
+        )
+    except ApiError as e:
+        if e.status_code == 400 and len(cursors) > 1:
+            # Cursor no longer valid: back to the first page
+            st.session_state.page_cursors = [None]
+            st.rerun()
+        st.error(f"❌ Could not load issues: {e.detail}")
+        return
 
-            # Action buttons
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                if st.button(f"Edit #{issue['issue_id']}", key=f"edit_{issue['issue_id']}"):
-                    st.info(f"Edit functionality for issue #{issue['id']}")
-            with col2:
-                if st.button(f"Mark Resolved #{issue['issue_id']}", key=f"resolve_{issue['issue_id']}"):
-                    issue['status'] = 'resolved'
-                    st.success(f"Issue #{issue['id']} marked as resolved!")
-                    st.rerun()
-            with col3:
-                if st.button(f"Close #{issue['issue_id']}", key=f"close_{issue['issue_id']}"):
-                    issue['status'] = 'closed'
-                    st.success(f"Issue #{issue['id']} closed!")
-                    st.rerun()
-            with col4:
-                if st.button(f"Delete #{issue['issue_id']}", key=f"delete_{issue['issue_id']}"):
-                    st.session_state.issues = [i for i in st.session_state.issues if i['issue_id'] != issue['issue_id']]
-                    st.success(f"Issue #{issue['issue_id']} deleted!")
-                    st.rerun()
+    issues = apply_overrides(issues)
+    if not issues:
+        st.info("No issues match the selected filters.")
+    elif view == 'Table':
+        st.dataframe(
+            [
+                {
+                    'ID': issue['issue_id'],
+                    'Title': issue['title'],
+                    'Priority': issue['priority'],
+                    'Status': issue['status'],
+                    'Tags': ", ".join(issue['tags']),
+                    'Estimate (min)': issue.get('estimated_minutes'),
+                    'Created': issue['created_at'],
+                    'Updated': issue['updated_at'],
+                }
+                for issue in issues
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+    else:
+        for issue in issues:
+            render_issue_card(issue)
 
-            st.markdown("---")
+    # Pager
+    first = (len(cursors) - 1) * page_size
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("◀ Previous", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if issues:
+            st.markdown(f"<center>Page {len(cursors)} • issues {first + 1}–{first + len(issues)}</center>",
+                        unsafe_allow_html=True)
+    with col3:
+        if st.button("Next ▶", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
 
 
 def show_ai_creator_page():
@@ -472,7 +669,11 @@ def show_ai_creator_page():
     if create_button and nl_input.strip():
         with st.spinner("🤖 AI is processing your input..."):
             # Simulate AI processing
-            new_issue = create_issue(nl_input.strip())
+            try:
+                new_issue = create_issue(nl_input.strip())
+            except ApiError as e:
+                st.error(f"❌ Could not create the issue: {e.detail}")
+                return
 
             # Add to issues
             st.session_state.issues.insert(0, new_issue)
@@ -569,7 +770,10 @@ def show_chat_updater_page():
 
         with st.spinner("🤖 Processing command..."):
             # Process command
-            result = update_issue(quote(user_input))
+            try:
+                result = update_issue(user_input)
+            except ApiError as e:
+                result = f"❌ {e.detail}"
 
             # if result['success']:
             #     response = result['message']
@@ -589,41 +793,28 @@ def show_chat_updater_page():
     st.markdown("### ⚡ Quick Actions")
 
     # Get open issues
-    open_issues = [i for i in st.session_state.issues if i['status'] in ['open', 'in_progress']]
+    open_issues = [i for i in apply_overrides(st.session_state.issues) if i['status'] in ['open', 'in_progress']]
 
     if open_issues:
         issue_options = [f"#{i['issue_id']} - {i['title'][:50]}" for i in open_issues]
         selected_issue_str = st.selectbox("Select an issue:", issue_options)
 
         if selected_issue_str:
-            issue_id = selected_issue_str.split(' - ')[0][1:]  # Extract ID
+            issue_id = int(selected_issue_str.split(' - ')[0][1:])  # Extract ID
 
+            # Structured PATCHes: no agent round trip for one-click changes
             col1, col2, col3 = st.columns(3)
-
             with col1:
-                if st.button("✅ Mark Resolved", use_container_width=True):
-                    command = f"Mark issue #{issue_id} as resolved"
-                    # st.session_state.chat_history.append({'role': 'user', 'content': command})
-                    # result = process_chat_command(command)
-                    result = update_issue(quote(command))
-                    # st.session_state.chat_history.append({'role': 'assistant', 'content': result})
-                    st.rerun()
+                if st.button("▶️ Start Progress", use_container_width=True):
+                    queue_action(issue_id, {'status': 'in_progress'}, f"Issue #{issue_id} is in progress")
 
             with col2:
                 if st.button("🔼 Set High Priority", use_container_width=True):
-                    command = f"Change priority of issue #{issue_id} to high"
-                    st.session_state.chat_history.append({'role': 'user', 'content': command})
-                    result = update_issue(quote(command))
-                    # st.session_state.chat_history.append({'role': 'assistant', 'content': result})
-                    st.rerun()
+                    queue_action(issue_id, {'priority': 'high'}, f"Issue #{issue_id} set to high priority")
 
             with col3:
                 if st.button("🚫 Close Issue", use_container_width=True):
-                    command = f"Close issue #{issue_id}"
-                    st.session_state.chat_history.append({'role': 'user', 'content': command})
-                    result = update_issue(quote(command))
-                    # st.session_state.chat_history.append({'role': 'assistant', 'content': result})
-                    st.rerun()
+                    queue_action(issue_id, {'status': 'closed'}, f"Issue #{issue_id} closed!")
     else:
         st.info("No open issues to update!")
 
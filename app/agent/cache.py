@@ -0,0 +1,129 @@
+"""
+Semantic cache for natural-language issue creation.
+
+Maps a query to the IssueCreate payload the agent previously extracted for it.
+Lookups try the normalized query text first and then fall back to the nearest
+cached query embedding in a FAISS inner-product index (cosine similarity on
+unit vectors). Entries expire after a TTL and the least recently used
+entry is evicted once the cache is full.
+"""
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Optional, Dict, Any, List
+
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(_NON_WORD.sub(" ", query.lower()).split())
+
+
+def _unit(vector: List[float]) -> List[float]:
+    # Inner product of unit vectors == cosine similarity
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class SemanticCache:
+    def __init__(self, embeddings, threshold: float = 0.92, ttl: float = 3600, max_entries: int = 1024):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # key -> (payload, stored_at, has_vector); ordered oldest -> most recently used
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # FAISS store is created on the first insert, once the embedding size is known
+        self._index: Optional[FAISS] = None
+        self._lock = threading.Lock()
+        self.counters = Counter()
+
+    @staticmethod
+    def _key(normalized: str) -> str:
+        return hashlib.sha1(normalized.encode()).hexdigest()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl > 0 and time.monotonic() - stored_at > self.ttl
+
+    def _remove(self, key: str):
+        _, _, has_vector = self._entries.pop(key)
+        if has_vector:
+            self._index.delete([key])
+
+    def get_exact(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the payload cached for this exact (normalized) query"""
+        key = self._key(normalize_query(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[1]):
+                self._remove(key)
+                self.counters["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hit_exact"] += 1
+            return entry[0]
+
+    def get_similar(self, vector: List[float]) -> Optional[Dict[str, Any]]:
+        """Return the payload of the closest cached query if it is within the threshold"""
+        with self._lock:
+            if self._index is None:
+                return None
+            matches = self._index.similarity_search_with_score_by_vector(_unit(vector), k=1)
+            if not matches:
+                return None
+            doc, score = matches[0]
+            if score < self.threshold:
+                return None
+
+            key = doc.metadata["key"]
+            payload, stored_at, _ = self._entries[key]
+            if self._expired(stored_at):
+                self._remove(key)
+                self.counters["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hit_semantic"] += 1
+            return payload
+
+    def put(self, query: str, payload: Dict[str, Any], vector: Optional[List[float]] = None):
+        """Cache a payload; without a vector the entry only serves exact matches"""
+        normalized = normalize_query(query)
+        key = self._key(normalized)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if vector is not None:
+                item = [(normalized, _unit(vector))]
+                metadata = [{"key": key}]
+                if self._index is None:
+                    self._index = FAISS.from_embeddings(
+                        item, self.embeddings, metadatas=metadata, ids=[key],
+                        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+                    )
+                else:
+                    self._index.add_embeddings(item, metadatas=metadata, ids=[key])
+            self._entries[key] = (payload, time.monotonic(), vector is not None)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.counters["evicted"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters["hit_exact"] + self.counters["hit_semantic"]
+        lookups = hits + self.counters["miss"]
+        return {
+            **dict(self.counters),
+            "size": len(self._entries),
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
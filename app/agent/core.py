@@ -1,22 +1,53 @@
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+
 from dotenv import load_dotenv
 
+from app import config, metrics
+from app.agent.cache import SemanticCache
+from app.agent.fast_path import try_fast_update
 from app.agent.tools.create_issue_tool import create_issue_tool
 from app.agent.tools.update_issue_tool import update_issue_tool
 
 load_dotenv()
 from langchain.agents import create_agent
-from langchain_community.vectorstores import FAISS
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.tools import create_retriever_tool
-from langchain_ollama import ChatOllama  # Changed import
+from langchain_ollama import ChatOllama, OllamaEmbeddings  # Changed import
+
+from app.api.schemas import IssueCreate
+
+logger = logging.getLogger(__name__)
+
+
+class AgentBusyError(Exception):
+    """Raised when every model slot stays busy for longer than AGENT_QUEUE_TIMEOUT"""
+
 
 class AgentService:
     def __init__(self):
         self.agent = self._build_agent()
+        # How many requests each path served ("fast_path" avoids the model)
+        self.path_hits = Counter()
+        # Bounds concurrent async model calls
+        self._model_slots = asyncio.Semaphore(config.AGENT_MAX_CONCURRENCY)
+        self._model_calls_in_flight = 0
+        self.cache = self._build_cache() if config.SEMANTIC_CACHE_ENABLED else None
+
+    def _build_cache(self):
+        return SemanticCache(
+            embeddings=OllamaEmbeddings(model=config.SEMANTIC_CACHE_EMBED_MODEL),
+            threshold=config.SEMANTIC_CACHE_THRESHOLD,
+            ttl=config.SEMANTIC_CACHE_TTL,
+            max_entries=config.SEMANTIC_CACHE_MAX_ENTRIES,
+        )
 
     def _build_agent(self):
         llm = ChatOllama(
-            model="llama3.1:8b",
+            model=config.AGENT_MODEL,
             temperature=0.1,
         )
 
@@ -57,17 +88,14 @@ class AgentService:
         )
         return agent
 
-    def process_chat(self,user_input,chat_history):
-        """Process a chat message and return the response"""
-
+    @staticmethod
+    def _build_messages(user_input, chat_history):
         # Only keep last 2-4 messages for context
         recent_history = chat_history[-10:] if len(chat_history) > 10 else chat_history
-        message = recent_history + [HumanMessage(content=user_input)]
-
-        response = self.agent.invoke({
-            "messages": message,
-        })
+        return recent_history + [HumanMessage(content=user_input)]
 
+    @staticmethod
+    def _parse_response(response):
         # Extract tool results
         tool_result = None
         tools_used = []
@@ -91,6 +119,155 @@ class AgentService:
             "tools_used": tools_used
         }
 
+    @staticmethod
+    def _record_call(started, messages, response):
+        """Latency, outcome and token metrics for one agent run"""
+        model = config.AGENT_MODEL
+        metrics.LLM_LATENCY.observe(time.perf_counter() - started, model=model)
+        metrics.LLM_CALLS.inc(model=model, outcome="ok" if response is not None else "error")
+        if response is not None:
+            # Only the messages produced by this run carry fresh usage
+            metrics.record_llm_usage(model, response["messages"][len(messages):])
+
+    def process_chat(self,user_input,chat_history):
+        """Process a chat message and return the response"""
+        messages = self._build_messages(user_input, chat_history)
+        started, response = time.perf_counter(), None
+        metrics.LLM_IN_FLIGHT.inc(model=config.AGENT_MODEL)
+        try:
+            with metrics.span("llm"):
+                response = self.agent.invoke({"messages": messages})
+        finally:
+            metrics.LLM_IN_FLIGHT.dec(model=config.AGENT_MODEL)
+            self._record_call(started, messages, response)
+        return self._parse_response(response)
+
+    async def aprocess_chat(self, user_input, chat_history):
+        """
+        Async version of process_chat.
+
+        Waits for one of AGENT_MAX_CONCURRENCY model slots so a burst of
+        requests queues here instead of in front of Ollama. Raises
+        AgentBusyError if no slot frees up within AGENT_QUEUE_TIMEOUT.
+        """
+        queued = time.perf_counter()
+        try:
+            with metrics.span("llm_queue"):
+                if config.AGENT_QUEUE_TIMEOUT > 0:
+                    await asyncio.wait_for(self._model_slots.acquire(), config.AGENT_QUEUE_TIMEOUT)
+                else:
+                    await self._model_slots.acquire()
+        except asyncio.TimeoutError:
+            metrics.LLM_CALLS.inc(model=config.AGENT_MODEL, outcome="busy")
+            raise AgentBusyError(
+                f"No model slot became free within {config.AGENT_QUEUE_TIMEOUT:g}s"
+            )
+        metrics.LLM_QUEUE_WAIT.observe(time.perf_counter() - queued, model=config.AGENT_MODEL)
+
+        messages = self._build_messages(user_input, chat_history)
+        started, response = time.perf_counter(), None
+        self._model_calls_in_flight += 1
+        metrics.LLM_IN_FLIGHT.inc(model=config.AGENT_MODEL)
+        try:
+            with metrics.span("llm"):
+                response = await self.agent.ainvoke({"messages": messages})
+        finally:
+            self._model_calls_in_flight -= 1
+            metrics.LLM_IN_FLIGHT.dec(model=config.AGENT_MODEL)
+            self._model_slots.release()
+            self._record_call(started, messages, response)
+        return self._parse_response(response)
+
+    async def _embed(self, user_input):
+        try:
+            with metrics.span("embed"):
+                return await self.cache.embeddings.aembed_query(user_input)
+        except Exception as e:
+            # Degrade to exact-match caching if the embedding model is unavailable
+            logger.warning("Semantic cache embedding failed: %s", e)
+            return None
+
+    async def aprocess_create(self, user_input, use_cache=True):
+        """
+        Process an NL create query, serving near-duplicates from the semantic cache.
+
+        With use_cache=False the cache is not consulted but the fresh result
+        still replaces whatever was cached for the query.
+        """
+        if self.cache is None:
+            return await self.aprocess_chat(user_input=user_input, chat_history=[])
+
+        vector = None
+        if use_cache:
+            payload = self.cache.get_exact(user_input)
+            if payload is None:
+                vector = await self._embed(user_input)
+                if vector is not None:
+                    payload = self.cache.get_similar(vector)
+            if payload is not None:
+                return {
+                    "content": "",
+                    "tool_result": json.dumps(payload),
+                    "tools_used": [],
+                    "cache": "hit"
+                }
+            self.cache.counters["miss"] += 1
+        else:
+            self.cache.counters["bypass"] += 1
+
+        response = await self.aprocess_chat(user_input=user_input, chat_history=[])
+        response["cache"] = "miss" if use_cache else "bypass"
+
+        if create_issue_tool.name in response["tools_used"] and response.get("tool_result"):
+            try:
+                payload = IssueCreate(**json.loads(response["tool_result"])).model_dump(mode="json")
+            except ValueError:
+                # Not a valid create payload; the route reports the error
+                return response
+            if vector is None:
+                vector = await self._embed(user_input)
+            self.cache.put(user_input, payload, vector)
+        return response
+
+    def _fast_update_response(self, tool_result):
+        self.path_hits["fast_path"] += 1
+        return {
+            "content": "",
+            "tool_result": json.dumps(tool_result),
+            "tools_used": [update_issue_tool.name],
+            "path": "fast_path"
+        }
+
+    def process_update(self, user_input):
+        """Process an update command, skipping the LLM when the fast path can parse it"""
+        tool_result = try_fast_update(user_input)
+        if tool_result is None:
+            self.path_hits["llm"] += 1
+            return self.process_chat(user_input=user_input, chat_history=[])
+        return self._fast_update_response(tool_result)
+
+    async def aprocess_update(self, user_input):
+        """Async version of process_update"""
+        tool_result = try_fast_update(user_input)
+        if tool_result is None:
+            self.path_hits["llm"] += 1
+            return await self.aprocess_chat(user_input=user_input, chat_history=[])
+        return self._fast_update_response(tool_result)
+
+    def stats(self):
+        """Return per-path hit counters and model slot usage"""
+        total = sum(self.path_hits.values())
+        return {
+            "paths": dict(self.path_hits),
+            "total": total,
+            "fast_path_ratio": self.path_hits["fast_path"] / total if total else 0.0,
+            "model_slots": {
+                "limit": config.AGENT_MAX_CONCURRENCY,
+                "in_use": self._model_calls_in_flight,
+            },
+            "semantic_cache": self.cache.stats() if self.cache else None
+        }
+
 if __name__ == "__main__":
     agent = AgentService()
     response = agent.process_chat(
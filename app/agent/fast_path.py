@@ -0,0 +1,146 @@
+"""
+Rule-based extractor for structured update commands.
+
+Handles the update patterns described in the agent system prompt
+("mark issue 7 as closed", "change priority of #12 from medium to high",
+"set tags of issue 3 to bug, urgent") without calling the LLM. Anything
+it cannot fully account for returns None so the caller falls back to the agent.
+"""
+import re
+from typing import Optional, Dict, Any
+
+from app.agent.tools.update_issue_tool import update_issue_tool
+
+# issue#12, issue 12, issue-12, ticket 12, ticket-12, #12
+_ISSUE_ID = re.compile(r"\b(?:issue|ticket)\s*(?:#|-|no\.?)?\s*(\d+)\b|#(\d+)\b", re.IGNORECASE)
+
+# "set tags to a, b", "set the tags of to a and b", "with tags a and b", "tags: a, b"
+_TAGS = re.compile(
+    r"\b(?:set\s+(?:the\s+)?tags?\s+(?:of\s+)?(?:to|as)|with\s+tags?|tags?\s*[:=])\s*(?P<tags>.+)$",
+    re.IGNORECASE,
+)
+
+_PRIORITY_VALUE = r"(low|medium|high)"
+_STATUS_VALUE = r"(open|in[\s_-]?progress|closed)"
+
+# "medium to high", "from open to in_progress"
+_PRIORITY_TRANSITION = re.compile(rf"\b(?:from\s+)?{_PRIORITY_VALUE}\s+to\s+{_PRIORITY_VALUE}\b", re.IGNORECASE)
+_STATUS_TRANSITION = re.compile(rf"\b(?:from\s+)?{_STATUS_VALUE}\s+to\s+{_STATUS_VALUE}\b", re.IGNORECASE)
+
+_PRIORITY = re.compile(rf"\b{_PRIORITY_VALUE}\b", re.IGNORECASE)
+_STATUS = re.compile(rf"\b{_STATUS_VALUE}\b", re.IGNORECASE)
+
+# A slot keyword followed by a value of the other slot: "status to low", "priority: closed"
+_SLOT_MISMATCH = re.compile(
+    rf"\bstatus\s*(?:(?:of|to|as|is|=|:)\s*)*{_PRIORITY_VALUE}\b"
+    rf"|\bpriority\s*(?:(?:of|to|as|is|=|:)\s*)*{_STATUS_VALUE}\b",
+    re.IGNORECASE,
+)
+
+# Verbs that imply a status on their own: "close it", "reopen issue 4"
+_STATUS_VERBS = {
+    "close": "closed",
+    "reopen": "open",
+}
+
+# Words allowed to remain once every recognised slot has been removed.
+# Anything else (e.g. a new title) means the command needs the LLM.
+_FILLER = {
+    "a", "an", "and", "as", "be", "change", "for", "from", "issue", "it",
+    "its", "make", "mark", "modify", "move", "now", "of", "please", "priority",
+    "set", "should", "status", "the", "ticket", "to", "update", "with",
+}
+
+_TAG_SPLIT = re.compile(r"\s*(?:,|\band\b|\s)\s*", re.IGNORECASE)
+
+# Words that end the tag list and start another clause: "tags bug then close it"
+_NOT_TAGS = _FILLER | set(_STATUS_VERBS) | {"also", "but", "then"}
+
+
+def _normalize_status(value: str) -> str:
+    value = value.lower()
+    return "in_progress" if value.startswith("in") else value
+
+
+def _take_single(pattern: re.Pattern, text: str, transition: re.Pattern):
+    """Return (value, remaining_text) for one slot, or (None, text); raise ValueError if ambiguous."""
+    match = transition.search(text)
+    if match:
+        return match.group(2), text[:match.start()] + " " + text[match.end():]
+
+    values = {m.group(1).lower() for m in pattern.finditer(text)}
+    if len(values) > 1:
+        raise ValueError("ambiguous")
+    if values:
+        return values.pop(), pattern.sub(" ", text)
+    return None, text
+
+
+def parse_update_command(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract update_issue_tool arguments from a structured update command.
+
+    Returns:
+        Dict with issue_id and the changed fields, or None if the command
+        cannot be parsed deterministically.
+    """
+    text = " ".join(query.strip().split())
+
+    ids = {int(a or b) for a, b in _ISSUE_ID.findall(text)}
+    if len(ids) != 1:
+        return None
+    args: Dict[str, Any] = {"issue_id": ids.pop()}
+    text = _ISSUE_ID.sub(" ", text)
+
+    if _SLOT_MISMATCH.search(text):
+        return None
+
+    tags_match = _TAGS.search(text)
+    if tags_match:
+        tags = [t.strip("\"'.") for t in _TAG_SPLIT.split(tags_match.group("tags"))]
+        tags = [t for t in tags if t]
+        # "set tags to bug and priority to high", "with tags bug then close it" -
+        # the tag list runs to the end, so any other clause in it goes to the LLM
+        if not tags or {t.lower() for t in tags} & _NOT_TAGS:
+            return None
+        args["tags"] = tags
+        text = text[:tags_match.start()]
+
+    try:
+        status, text = _take_single(_STATUS, text, _STATUS_TRANSITION)
+        priority, text = _take_single(_PRIORITY, text, _PRIORITY_TRANSITION)
+    except ValueError:
+        return None
+
+    # Stray numbers ("close issue 3 and 4", "estimate 30 minutes") need the LLM
+    if re.search(r"\d", text):
+        return None
+
+    words = re.findall(r"[a-z_]+", text.lower())
+    # "update issue 5 status to low": a slot named without a value of its own
+    if ("status" in words and not status) or ("priority" in words and not priority):
+        return None
+    for word in words:
+        if word in _STATUS_VERBS:
+            if status and _normalize_status(status) != _STATUS_VERBS[word]:
+                return None
+            status = _STATUS_VERBS[word]
+        elif word not in _FILLER:
+            return None
+
+    if status:
+        args["status"] = _normalize_status(status)
+    if priority:
+        args["priority"] = priority
+
+    if len(args) == 1:
+        return None
+    return args
+
+
+def try_fast_update(query: str) -> Optional[Dict[str, Any]]:
+    """Run the update_issue_tool logic directly if the command parses, else None."""
+    args = parse_update_command(query)
+    if args is None:
+        return None
+    return update_issue_tool.invoke(args)
@@ -1,23 +1,102 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app import config
+from app.api.migrations import run_migrations
 from app.api.models import Base
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./issues.db"
+# Database URL (DATABASE_URL env var, SQLite by default)
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+# Connect-time pragmas per engine profile
+SQLITE_PROFILES = {
+    # SQLite's own defaults: rollback journal, synchronous=FULL
+    "default": {},
+    # WAL lets readers run alongside the writer; synchronous=NORMAL is still
+    # crash-safe in WAL mode and only fsyncs at checkpoints
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,        # ms to wait on a lock before "database is locked"
+        "cache_size": -64000,        # negative = KiB, i.e. 64 MiB page cache per connection
+        "mmap_size": 268435456,      # 256 MiB memory-mapped reads
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def sqlite_pragmas(profile=None):
+    """Pragmas for the given profile with SQLITE_* env overrides applied"""
+    profile = profile or config.DB_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}, expected one of {sorted(SQLITE_PROFILES)}")
+    return {**SQLITE_PROFILES[profile], **config.SQLITE_PRAGMA_OVERRIDES}
+
+
+def _is_memory_sqlite(url):
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def engine_options(url, profile=None):
+    """create_engine keyword arguments for the URL and profile"""
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return {
+            "poolclass": QueuePool,
+            "pool_size": config.DB_POOL_SIZE,
+            "max_overflow": config.DB_MAX_OVERFLOW,
+            "pool_timeout": config.DB_POOL_TIMEOUT,
+            "pool_pre_ping": True,
+        }
+
+    options = {"connect_args": {"check_same_thread": False}}  # Needed for SQLite
+    if _is_memory_sqlite(url):
+        # Every connection to :memory: is a new database; share a single one
+        options["poolclass"] = StaticPool
+    else:
+        # One connection per threadpool worker, reused instead of reopened per request
+        options.update(
+            poolclass=QueuePool,
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def install_sqlite_pragmas(engine, profile=None):
+    """Run the profile's PRAGMA statements on every new DBAPI connection"""
+    pragmas = sqlite_pragmas(profile)
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def build_engine(url=SQLALCHEMY_DATABASE_URL, profile=None, **kwargs):
+    """Create an engine for the URL with the configured pool and SQLite profile"""
+    engine = create_engine(url, **{**engine_options(url, profile), **kwargs})
+    if engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(engine, profile)
+    return engine
+
 
 # Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+engine = build_engine()
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def init_db():
-    """Initialize the database by creating all tables"""
+    """Initialize the database by creating all tables and applying pending migrations"""
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
 
 
 def get_db():
@@ -26,4 +105,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
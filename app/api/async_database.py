@@ -0,0 +1,54 @@
+"""
+Async database stack (AsyncEngine + AsyncSession), enabled with DB_ASYNC=true.
+
+Uses the same URL, pool sizing and SQLite pragma profile as app.api.Database,
+with the driver swapped for an async one.
+"""
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app import config
+from app.api.Database import engine_options, install_sqlite_pragmas
+
+# sync driver -> async driver
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_url(url):
+    """Return the URL with an async driver, e.g. sqlite:///x.db -> sqlite+aiosqlite:///x.db"""
+    url = make_url(url)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    return url.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = config.ASYNC_DATABASE_URL or async_url(config.DATABASE_URL)
+
+
+def build_async_engine(url=ASYNC_DATABASE_URL, profile=None, **kwargs):
+    """Create an AsyncEngine with the same pool and SQLite profile as the sync engine"""
+    options = engine_options(url, profile)
+    if options.get("poolclass") is QueuePool:
+        options["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **{**options, **kwargs})
+    if engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(engine.sync_engine, profile)
+    return engine
+
+
+async_engine = build_async_engine()
+
+# expire_on_commit=False so committed objects can be serialized without another round trip
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db():
+    """Dependency for getting async database sessions"""
+    async with AsyncSessionLocal() as db:
+        yield db
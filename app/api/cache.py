@@ -0,0 +1,226 @@
+"""
+Response cache and conditional GET support for the read routes.
+
+Every write to the issues table bumps a version counter. Read responses get
+a weak ETag derived from that version and the backend's epoch, so a client that sends it back in
+If-None-Match gets a 304 until something changes. Serialized response bodies
+are also kept in an LRU/TTL cache keyed by URL and version, so repeated reads
+skip the query and the Pydantic serialization. Old-version entries are
+never looked up again and age out of the LRU.
+
+The default backend is in-process. Set RESPONSE_CACHE_BACKEND to
+"package.module:factory" to use a shared one; the factory is called with
+max_entries and ttl and must return an object with the MemoryBackend methods.
+The version counter lives in the backend, so a shared backend also shares
+invalidation between workers; it must also expose an `epoch` string that
+is the same for every worker and changes whenever its counters are reset.
+The in-process backend picks a random epoch at startup, so ETags from
+before a restart or from another worker never match.
+
+Writes made outside the API are not seen by a running server with the
+in-process backend: its version does not move, so conditional GETs keep
+returning 304 until the server restarts. The bulk importer CLI bumps the
+version when it finishes, which reaches the server only through a shared
+backend.
+
+Single issues are not cached here: they get a strong ETag built from their
+own updated_at (`issue_etag`), which only changes when that issue does and
+doubles as the version for If-Match on PATCH.
+"""
+import importlib
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from datetime import datetime
+from typing import Optional, List
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app import config
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int = 512, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Counters restart at 0 with the process; the epoch keeps old ETags from matching
+        self.epoch = uuid.uuid4().hex[:8]
+        # key -> (value, stored_at); ordered oldest -> most recently used
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Counters are kept apart from the entries so they are never evicted
+        self._counters = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl > 0 and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters[name]
+
+    def incr(self, name: str) -> int:
+        with self._lock:
+            self._counters[name] += 1
+            return self._counters[name]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl}
+
+
+def load_backend(spec: Optional[str], max_entries: int, ttl: float):
+    """Build the backend named by "package.module:factory", or the in-process one"""
+    if not spec:
+        return MemoryBackend(max_entries=max_entries, ttl=ttl)
+    module_name, _, attr = spec.partition(":")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory(max_entries=max_entries, ttl=ttl)
+
+
+@lru_cache(maxsize=None)
+def _adapter(model):
+    return TypeAdapter(model)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison, so the W/ prefix is ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def issue_etag(issue) -> str:
+    """Strong ETag for one version of an issue"""
+    return f'"{issue.issue_id}-{issue.updated_at.isoformat()}"'
+
+
+def if_match_versions(if_match: str, issue_id: int) -> Optional[List[datetime]]:
+    """
+    The updated_at values an If-Match header accepts for `issue_id`: None for
+    "*" (any version), [] when no tag can match. Weak tags never match
+    (If-Match uses strong comparison).
+    """
+    if if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if not (tag.startswith('"') and tag.endswith('"')):
+            continue
+        tag_id, _, updated_at = tag[1:-1].partition("-")
+        if tag_id != str(issue_id):
+            continue
+        try:
+            versions.append(datetime.fromisoformat(updated_at))
+        except ValueError:
+            continue
+    return versions
+
+
+def issue_response(request: Request, issue, model) -> Response:
+    """`issue` serialized as `model` with its ETag, or 304 if If-None-Match already has it"""
+    etag = issue_etag(issue)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    body = _adapter(model).dump_json(_adapter(model).validate_python(issue, from_attributes=True))
+    return Response(content=body, media_type="application/json",
+                    headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+class ResponseCache:
+    # Response headers that are part of the cached page (set by finish_page)
+    CACHED_HEADERS = ("X-Next-Cursor", "Link")
+
+    def __init__(self, backend, enabled: bool = True, namespace: str = "issues"):
+        self.backend = backend
+        self.enabled = enabled
+        self.namespace = namespace
+        self.counters = Counter()
+
+    def version(self) -> int:
+        return self.backend.counter(f"{self.namespace}:version")
+
+    def invalidate(self) -> int:
+        """Call after every committed write to the issues table"""
+        return self.backend.incr(f"{self.namespace}:version")
+
+    def lookup(self, request: Request):
+        """
+        Return (response, token). `response` is a 304 or a cached 200 that can
+        be returned as is; when it is None, build the data and pass the token
+        to render().
+        """
+        # Read the version once: a write during the build leaves the result
+        # labelled with the version it was read at
+        version = self.version()
+        etag = f'W/"{self.namespace}-{self.backend.epoch}-{version}"'
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            self.counters["not_modified"] += 1
+            return Response(status_code=304, headers={"ETag": etag}), None
+
+        key = f"{self.namespace}:{version}:{request.url.path}?{sorted(request.query_params.multi_items())}"
+        if self.enabled:
+            cached = self.backend.get(key)
+            if cached is not None:
+                self.counters["hit"] += 1
+                body, headers = cached
+                return self._response(body, headers, etag, "HIT"), None
+        self.counters["miss"] += 1
+        return None, (key, etag)
+
+    def render(self, token, model, data, response: Optional[Response] = None) -> Response:
+        """Serialize `data` as `model`, store it and return it with the ETag"""
+        key, etag = token
+        body = _adapter(model).dump_json(_adapter(model).validate_python(data, from_attributes=True))
+        headers = {}
+        if response is not None:
+            headers = {name: response.headers[name] for name in self.CACHED_HEADERS if name in response.headers}
+        if self.enabled:
+            self.backend.set(key, (body, headers))
+        return self._response(body, headers, etag, "MISS")
+
+    @staticmethod
+    def _response(body: bytes, headers, etag: str, cache_status: str) -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            # no-cache: clients may store the body but must revalidate with If-None-Match
+            headers={**headers, "ETag": etag, "Cache-Control": "no-cache", "X-Cache": cache_status},
+        )
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "epoch": self.backend.epoch,
+            "version": self.version(),
+            **self.counters,
+            **self.backend.stats(),
+        }
+
+
+response_cache = ResponseCache(
+    load_backend(config.RESPONSE_CACHE_BACKEND, config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_TTL),
+    enabled=config.RESPONSE_CACHE_ENABLED,
+)
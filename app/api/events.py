@@ -0,0 +1,115 @@
+"""
+In-process feed of issue changes for live dashboards.
+
+Writes publish `created`, `updated` and `deleted` events, or `reset` for bulk
+changes such as imports after which clients should reload. Events go into a
+ring buffer of the last EVENTS_BUFFER_SIZE events, each with an increasing
+offset. Clients resume after the last event they saw through
+GET /events (SSE, with Last-Event-ID), the /ws WebSocket or GET /events/since.
+
+Positions are passed around as tokens of the form "<epoch>:<offset>". The
+epoch is random per process, so a token from before a restart is rejected
+rather than silently skipping events. A token that is too old or from
+another epoch raises OffsetExpired (410 Gone over HTTP); the client then
+reloads the list and resumes from its X-Event-Offset header.
+
+Like the metrics, the feed is per process: with several workers, route each
+dashboard to one worker or swap in a shared broker.
+"""
+import asyncio
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Optional
+
+from app import config
+
+
+class OffsetExpired(Exception):
+    """The requested position is no longer (or was never) in the buffer"""
+
+
+class EventBus:
+    def __init__(self, size: int = 1000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._events = deque(maxlen=size)
+        self._offset = 0
+        self._lock = threading.Lock()
+        # (loop, asyncio.Event) per live subscriber; set from any thread
+        self._waiters = set()
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    def token(self, offset: Optional[int] = None) -> str:
+        return f"{self.epoch}:{self._offset if offset is None else offset}"
+
+    def parse_token(self, token: str) -> int:
+        """Offset for a token; raises ValueError if malformed, OffsetExpired if from another epoch"""
+        epoch, sep, offset = token.partition(":")
+        if not sep or not offset.isdigit():
+            raise ValueError(f"Invalid event offset {token!r}")
+        if epoch != self.epoch:
+            raise OffsetExpired("Event stream restarted; reload and resume from X-Event-Offset")
+        return int(offset)
+
+    def publish(self, type: str, issue_id: Optional[int] = None, issue=None) -> dict:
+        """Record an event; safe to call from sync routes running in the threadpool"""
+        with self._lock:
+            self._offset += 1
+            event = {
+                "offset": self._offset,
+                "id": self.token(self._offset),
+                "type": type,
+                "issue_id": issue_id,
+                "issue": issue.model_dump(mode="json") if issue is not None else None,
+                "at": datetime.utcnow().isoformat(),
+            }
+            self._events.append(event)
+            waiters = list(self._waiters)
+        for loop, wake in waiters:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                # Subscriber's loop has closed
+                pass
+        return event
+
+    def since(self, offset: int) -> list:
+        """Events after `offset`, oldest first"""
+        with self._lock:
+            oldest = self._offset - len(self._events)
+            if offset < oldest or offset > self._offset:
+                raise OffsetExpired(f"Offset {offset} is outside the buffered range {oldest}-{self._offset}")
+            return list(islice(self._events, offset - oldest, None))
+
+    async def subscribe(self, offset: int, heartbeat: float = 15.0):
+        """
+        Yield lists of new events as they are published, starting after
+        `offset`; yields [] every `heartbeat` seconds without events.
+        """
+        wake = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), wake)
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            while True:
+                wake.clear()
+                events = self.since(offset)
+                if events:
+                    offset = events[-1]["offset"]
+                    yield events
+                    continue
+                try:
+                    await asyncio.wait_for(wake.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield []
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+event_bus = EventBus(config.EVENTS_BUFFER_SIZE)
@@ -0,0 +1,84 @@
+"""
+Streaming issue export as NDJSON or CSV.
+
+Rows are read through a server-side cursor in fixed-size partitions and
+written out one partition at a time, so memory use does not depend on how
+many issues are exported. Rows stay Core rows (no ORM objects or Pydantic
+models) to keep the per-row cost low.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import select
+
+from app.api.models import Issue
+from app.api.queries import apply_filters
+from app.api.schemas import IssueFilters
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+# Same fields and order as IssueResponse
+EXPORT_COLUMNS = [
+    Issue.issue_id, Issue.title, Issue.description, Issue.priority, Issue.status, Issue.tags,
+    Issue.root_cause_hint, Issue.estimated_minutes, Issue.created_at, Issue.updated_at,
+]
+FIELDNAMES = [column.key for column in EXPORT_COLUMNS]
+
+# Separator for the tags column in CSV output
+CSV_TAG_SEPARATOR = ";"
+
+
+def export_statement(filters: IssueFilters):
+    # issue_id order is the primary key scan, and keeps exports reproducible
+    return apply_filters(select(*EXPORT_COLUMNS), filters).order_by(Issue.issue_id)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _ndjson_chunk(rows):
+    return "".join(json.dumps(dict(row._mapping), default=_json_default) + "\n" for row in rows)
+
+
+def _csv_chunk(rows, header=False):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(FIELDNAMES)
+    for row in rows:
+        values = list(row)
+        values[FIELDNAMES.index("tags")] = CSV_TAG_SEPARATOR.join(row.tags or [])
+        writer.writerow(values)
+    return buffer.getvalue()
+
+
+def stream_export(engine, filters: IssueFilters, fmt: ExportFormat, batch_size: int = 1000):
+    """
+    Yield the export body in chunks of `batch_size` rows.
+
+    Opens its own connection: the response body is produced after the
+    request's dependencies (and their session) may already have exited.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            export_statement(filters)
+        )
+        if fmt == ExportFormat.csv:
+            yield _csv_chunk([], header=True)
+        for rows in result.partitions():
+            yield _ndjson_chunk(rows) if fmt == ExportFormat.ndjson else _csv_chunk(rows)
@@ -0,0 +1,252 @@
+"""
+Bulk import of issues from JSON, NDJSON or CSV files.
+
+    python -m app.api.importer data/issues.json
+    python -m app.api.importer dump.ndjson --chunk-size 20000 --rejects rejects.ndjson
+
+Input is read as a stream (a JSON array is decoded one element at a time),
+each record is validated with IssueImport, and valid rows are inserted with
+one executemany per chunk, each chunk in its own transaction. Invalid
+records are counted and reported but do not stop the import. Incoming ids
+are ignored; every imported issue gets a new issue_id.
+
+CSV files use the export layout: a header row, and tags joined with ";".
+"""
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from enum import Enum
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+
+from app.api.models import Issue
+from app.api.schemas import IssueImport, ImportReject, ImportReport
+
+
+class ImportFormat(str, Enum):
+    json = "json"
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+# Max number of rejects kept on the report (all of them are counted)
+MAX_REPORTED_REJECTS = 100
+
+_READ_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n"
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\s*\Z")
+
+
+class InvalidRecord(ValueError):
+    pass
+
+
+def detect_format(filename: str) -> ImportFormat:
+    name = filename.lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return ImportFormat.ndjson
+    if name.endswith(".csv"):
+        return ImportFormat.csv
+    return ImportFormat.json
+
+
+def iter_json_array(f):
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(_READ_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return not eof
+
+    def next_char():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return buffer[pos] if pos < len(buffer) else ""
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    first = True
+    while True:
+        char = next_char()
+        if char == "]":
+            return
+        if not first:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element continues past the buffered text
+                if not fill():
+                    raise
+                continue
+            # A number cut off by the end of the buffer ("12" of "12345", "2." of "2.5")
+            # decodes as a shorter one; read on until something follows it
+            if not eof and _NUMBER_TAIL.match(buffer, end):
+                fill()
+                continue
+            break
+        pos = end
+        first = False
+        yield item
+
+
+def iter_ndjson(f):
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield InvalidRecord(f"Invalid JSON: {e}")
+
+
+def iter_csv(f):
+    for row in csv.DictReader(f):
+        # Empty cells mean "not set", so model defaults apply
+        record = {key: value for key, value in row.items() if key and value not in ("", None)}
+        if "tags" in record:
+            record["tags"] = [tag for tag in record["tags"].split(";") if tag]
+        yield record
+
+
+READERS = {
+    ImportFormat.json: iter_json_array,
+    ImportFormat.ndjson: iter_ndjson,
+    ImportFormat.csv: iter_csv,
+}
+
+
+def _to_row(record, now):
+    if isinstance(record, Exception):
+        raise record
+    if not isinstance(record, dict):
+        raise InvalidRecord(f"Expected an object, got {type(record).__name__}")
+    issue = IssueImport.model_validate(record)
+    data = issue.model_dump()
+    data["priority"], data["status"] = issue.priority.value, issue.status.value
+    # Every row needs the same keys for executemany
+    data["created_at"] = issue.created_at or now
+    data["updated_at"] = issue.updated_at or data["created_at"]
+    return data
+
+
+def _reject(report: ImportReport, record: int, error: str):
+    report.rejected += 1
+    if len(report.rejects) < MAX_REPORTED_REJECTS:
+        report.rejects.append(ImportReject(record=record, error=error))
+
+
+def import_issues(engine, f, fmt: ImportFormat, chunk_size: int = 5000, on_progress=None, on_reject=None):
+    """
+    Import issues from the text stream `f` and return an ImportReport.
+
+    on_progress(report) is called after every chunk; on_reject(record_number,
+    record, error) for every rejected record.
+    """
+    report = ImportReport()
+    start = time.perf_counter()
+    chunk, numbers = [], []
+
+    def flush():
+        if not chunk:
+            return
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(Issue.__table__), chunk)
+            report.imported += len(chunk)
+        except Exception as e:
+            for number, row in zip(numbers, chunk):
+                _reject(report, number, f"Insert failed: {e}")
+                if on_reject:
+                    on_reject(number, row, str(e))
+        chunk.clear()
+        numbers.clear()
+        report.seconds = time.perf_counter() - start
+        report.rows_per_second = report.imported / report.seconds if report.seconds else 0.0
+        if on_progress:
+            on_progress(report)
+
+    now = datetime.utcnow()
+    for number, record in enumerate(READERS[fmt](f), start=1):
+        report.read += 1
+        try:
+            chunk.append(_to_row(record, now))
+            numbers.append(number)
+        except ValidationError as e:
+            error = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'record'}: {err['msg']}" for err in e.errors())
+        except ValueError as e:
+            error = str(e)
+        else:
+            if len(chunk) >= chunk_size:
+                flush()
+            continue
+        _reject(report, number, error)
+        if on_reject:
+            on_reject(number, record, error)
+    flush()
+    report.seconds = time.perf_counter() - start
+    report.rows_per_second = report.imported / report.seconds if report.seconds else 0.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import issues from a JSON, NDJSON or CSV file")
+    parser.add_argument("path", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat],
+                        help="Defaults to the file extension (.ndjson/.jsonl, .csv, else json)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per insert transaction")
+    parser.add_argument("--rejects", help="Write rejected records and errors to this NDJSON file")
+    args = parser.parse_args()
+
+    from app.api.Database import engine, init_db
+    init_db()
+
+    fmt = ImportFormat(args.format) if args.format else detect_format(args.path)
+    rejects_file = open(args.rejects, "w") if args.rejects else None
+
+    def on_reject(number, record, error):
+        if rejects_file:
+            rejects_file.write(json.dumps({"record": number, "error": error, "data": record}, default=str) + "\n")
+
+    def on_progress(report):
+        print(f"\r{report.read:,} read, {report.imported:,} imported, {report.rejected:,} rejected, "
+              f"{report.rows_per_second:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    source = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8") if args.path == "-" \
+        else open(args.path, encoding="utf-8", newline="")
+    try:
+        with source:
+            report = import_issues(engine, source, fmt, args.chunk_size, on_progress, on_reject)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+    print(file=sys.stderr)
+    print(report.model_dump_json(indent=2))
+
+    if report.imported:
+        # Only reaches a running server through a shared RESPONSE_CACHE_BACKEND
+        from app.api.cache import response_cache
+        response_cache.invalidate()
+
+
+if __name__ == "__main__":
+    main()
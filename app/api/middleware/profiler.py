@@ -0,0 +1,54 @@
+import hmac
+import random
+import time
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+from app import config
+from app.api.profiling import ProfileMode, request_profiler
+
+
+def is_admin(request: Request) -> bool:
+    token = request.headers.get("x-admin-token", "")
+    return bool(config.ADMIN_TOKEN) and hmac.compare_digest(token, config.ADMIN_TOKEN)
+
+
+def _requested_mode(request: Request):
+    requested = request.headers.get("x-profile")
+    if requested:
+        # Explicit profiling is an admin action
+        if not is_admin(request):
+            return None
+        try:
+            return ProfileMode(requested.lower())
+        except ValueError:
+            return ProfileMode(config.PROFILER_MODE)
+    if config.PROFILER_SAMPLE_RATE > 0 and random.random() < config.PROFILER_SAMPLE_RATE:
+        return ProfileMode(config.PROFILER_MODE)
+    return None
+
+
+async def profiler_middleware(request: Request, call_next):
+    mode = _requested_mode(request)
+    session = request_profiler.try_begin(mode) if mode else None
+    if session is None:
+        return await call_next(request)
+
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        request_profiler.stop_collecting(session)
+        # Serializing, writing and rotating profiles would otherwise stall the event loop
+        meta = await run_in_threadpool(
+            request_profiler.finish,
+            session,
+            method=request.method,
+            path=request.url.path,
+            status=status_code,
+            seconds=round(time.perf_counter() - start, 6),
+        )
+    response.headers["X-Profile-Id"] = meta["id"]
+    return response
@@ -1,8 +1,45 @@
+import json
 import time
 from fastapi import Request
 
+from app import config, metrics
+
+
+def _route_template(request: Request) -> str:
+    # The matched path template (e.g. /api/issues/issue/{issue_id}) keeps label cardinality bounded
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
 async def timing_middleware(request: Request,call_next):
+    stats = metrics.RequestStats()
+    token = metrics.current_request.set(stats)
+    method = request.method
+    metrics.HTTP_IN_FLIGHT.inc(method=method)
     start = time.perf_counter()
-    response = await call_next(request)
-    response.headers["X-Process-Time"] =f"{time.perf_counter() - start:.4f}s"
-    return response
\ No newline at end of file
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.HTTP_IN_FLIGHT.dec(method=method)
+        route = _route_template(request)
+        metrics.HTTP_REQUESTS.inc(method=method, route=route, status=status_code)
+        metrics.HTTP_LATENCY.observe(elapsed, method=method, route=route)
+        stats.finish(route)
+        metrics.current_request.reset(token)
+    response.headers["X-Process-Time"] =f"{elapsed:.4f}s"
+    if config.SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = stats.server_timing(elapsed)
+    if config.REQUEST_TIMING_LOG:
+        print(json.dumps({
+            "method": method,
+            "route": route,
+            "status": status_code,
+            "ms": round(elapsed * 1000, 2),
+            "sql_queries": stats.db_queries,
+            "sql_ms": round(stats.db_seconds * 1000, 2),
+            "spans": {name: round(seconds * 1000, 2) for name, (seconds, _) in stats.spans.items()},
+        }), flush=True)
+    return response
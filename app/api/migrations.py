@@ -0,0 +1,232 @@
+"""
+Lightweight versioned schema migrations.
+
+`Base.metadata.create_all` only creates missing tables, so changes to existing
+tables (new indexes, columns, triggers) are applied here instead. Each
+migration runs once, in version order, inside its own transaction and is
+recorded in the `schema_migrations` table.
+
+Add a migration with:
+
+    @migration(2, "Describe the change")
+    def _my_change(conn):
+        conn.exec_driver_sql("...")
+
+Migrations must be idempotent against a freshly created schema, because
+`create_all` builds new databases from the current models before they run.
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+
+MIGRATIONS = {}
+
+
+def migration(version, description):
+    def register(fn):
+        if version in MIGRATIONS:
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS[version] = (description, fn)
+        return fn
+    return register
+
+
+def _ensure_version_table(conn):
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR(255) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    )
+
+
+def applied_versions(conn):
+    _ensure_version_table(conn)
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def run_migrations(engine):
+    """Apply all pending migrations and return the versions that were applied"""
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for version in sorted(MIGRATIONS):
+        if version in done:
+            continue
+        description, fn = MIGRATIONS[version]
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {"version": version, "description": description, "applied_at": datetime.utcnow()}
+            )
+        print(f"Applied migration {version}: {description}")
+        applied.append(version)
+    return applied
+
+
+@migration(1, "Secondary indexes for issue list and filter queries")
+def _issue_list_indexes(conn):
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_issues_status_created ON issues (status, created_at, issue_id)")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_issues_priority_created ON issues (priority, created_at, issue_id)")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_issues_created ON issues (created_at, issue_id)")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_issues_updated ON issues (updated_at, issue_id)")
+    if conn.dialect.name == "sqlite":
+        # Give the query planner statistics for the new indexes
+        conn.exec_driver_sql("ANALYZE issues")
+
+
+@migration(2, "FTS5 full-text index over issue title, description and root_cause_hint")
+def _issue_fts(conn):
+    if conn.dialect.name != "sqlite":
+        # Full-text search is SQLite FTS5 only; /search reports 501 elsewhere
+        return
+    # External-content table: the text lives in `issues`, FTS5 only stores the index
+    conn.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+        "title, description, root_cause_hint, "
+        "content='issues', content_rowid='issue_id', tokenize='porter unicode61')"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN "
+        "INSERT INTO issues_fts (rowid, title, description, root_cause_hint) "
+        "VALUES (new.issue_id, new.title, new.description, new.root_cause_hint); "
+        "END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN "
+        "INSERT INTO issues_fts (issues_fts, rowid, title, description, root_cause_hint) "
+        "VALUES ('delete', old.issue_id, old.title, old.description, old.root_cause_hint); "
+        "END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, description, root_cause_hint "
+        "ON issues BEGIN "
+        "INSERT INTO issues_fts (issues_fts, rowid, title, description, root_cause_hint) "
+        "VALUES ('delete', old.issue_id, old.title, old.description, old.root_cause_hint); "
+        "INSERT INTO issues_fts (rowid, title, description, root_cause_hint) "
+        "VALUES (new.issue_id, new.title, new.description, new.root_cause_hint); "
+        "END"
+    )
+    # Index rows that existed before the triggers
+    conn.exec_driver_sql("INSERT INTO issues_fts (issues_fts) VALUES ('rebuild')")
+
+
+_SYNC_ISSUE_TAGS = (
+    "INSERT OR IGNORE INTO issue_tags (issue_id, tag) "
+    "SELECT new.issue_id, value FROM json_each(new.tags) WHERE type = 'text'; "
+)
+
+
+@migration(3, "issue_tags association table kept in sync with issues.tags")
+def _issue_tags(conn):
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS issue_tags ("
+        "issue_id INTEGER NOT NULL REFERENCES issues (issue_id) ON DELETE CASCADE, "
+        "tag VARCHAR(100) NOT NULL, "
+        "PRIMARY KEY (issue_id, tag))"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_issue_tags_tag ON issue_tags (tag, issue_id)")
+    if conn.dialect.name != "sqlite":
+        # The triggers below use SQLite's json_each; other backends need their own
+        return
+
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_tags_ai AFTER INSERT ON issues BEGIN "
+        + _SYNC_ISSUE_TAGS +
+        "END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_tags_au AFTER UPDATE OF tags ON issues BEGIN "
+        "DELETE FROM issue_tags WHERE issue_id = old.issue_id; "
+        + _SYNC_ISSUE_TAGS +
+        "END"
+    )
+    # Explicit rather than relying on ON DELETE CASCADE, which needs PRAGMA foreign_keys
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_tags_ad AFTER DELETE ON issues BEGIN "
+        "DELETE FROM issue_tags WHERE issue_id = old.issue_id; "
+        "END"
+    )
+    # Move existing JSON tags over
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO issue_tags (issue_id, tag) "
+        "SELECT issues.issue_id, json_each.value FROM issues, json_each(issues.tags) "
+        "WHERE json_each.type = 'text'"
+    )
+
+
+def _bump_counter(dimension, value, sign, minutes):
+    return (
+        "INSERT INTO issue_counters (dimension, value, issues, estimated_minutes) "
+        f"VALUES ('{dimension}', {value}, {sign}1, {sign}COALESCE({minutes}, 0)) "
+        "ON CONFLICT (dimension, value) DO UPDATE SET "
+        "issues = issues + excluded.issues, "
+        "estimated_minutes = estimated_minutes + excluded.estimated_minutes; "
+    )
+
+
+@migration(4, "issue_counters materialized status/priority/tag counts")
+def _issue_counters(conn):
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS issue_counters ("
+        "dimension VARCHAR(20) NOT NULL, "
+        "value VARCHAR(100) NOT NULL, "
+        "issues INTEGER NOT NULL DEFAULT 0, "
+        "estimated_minutes INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (dimension, value))"
+    )
+    if conn.dialect.name != "sqlite":
+        # Without triggers the stats endpoint falls back to GROUP BY queries
+        return
+
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_counters_ai AFTER INSERT ON issues BEGIN "
+        + _bump_counter("status", "new.status", "+", "new.estimated_minutes")
+        + _bump_counter("priority", "new.priority", "+", "new.estimated_minutes")
+        + "END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_counters_ad AFTER DELETE ON issues BEGIN "
+        + _bump_counter("status", "old.status", "-", "old.estimated_minutes")
+        + _bump_counter("priority", "old.priority", "-", "old.estimated_minutes")
+        + "END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_counters_au "
+        "AFTER UPDATE OF status, priority, estimated_minutes ON issues BEGIN "
+        + _bump_counter("status", "old.status", "-", "old.estimated_minutes")
+        + _bump_counter("priority", "old.priority", "-", "old.estimated_minutes")
+        + _bump_counter("status", "new.status", "+", "new.estimated_minutes")
+        + _bump_counter("priority", "new.priority", "+", "new.estimated_minutes")
+        + "END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_counters_tag_ai AFTER INSERT ON issue_tags BEGIN "
+        + _bump_counter("tag", "new.tag", "+", "NULL")
+        + "END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS issue_counters_tag_ad AFTER DELETE ON issue_tags BEGIN "
+        + _bump_counter("tag", "old.tag", "-", "NULL")
+        + "END"
+    )
+
+    # Seed from the current data
+    conn.exec_driver_sql("DELETE FROM issue_counters")
+    for dimension in ("status", "priority"):
+        conn.exec_driver_sql(
+            "INSERT INTO issue_counters (dimension, value, issues, estimated_minutes) "
+            f"SELECT '{dimension}', {dimension}, COUNT(*), COALESCE(SUM(estimated_minutes), 0) "
+            f"FROM issues GROUP BY {dimension}"
+        )
+    conn.exec_driver_sql(
+        "INSERT INTO issue_counters (dimension, value, issues, estimated_minutes) "
+        "SELECT 'tag', tag, COUNT(*), 0 FROM issue_tags GROUP BY tag"
+    )
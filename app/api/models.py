@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Integer, DateTime, JSON
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Index, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -20,5 +20,44 @@ class Issue(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Match the list queries: filter by status/priority, keyset on (created_at|updated_at, issue_id).
+    # Existing databases get these through app.api.migrations.
+    __table_args__ = (
+        Index("ix_issues_status_created", "status", "created_at", "issue_id"),
+        Index("ix_issues_priority_created", "priority", "created_at", "issue_id"),
+        Index("ix_issues_created", "created_at", "issue_id"),
+        Index("ix_issues_updated", "updated_at", "issue_id"),
+    )
+
     def __repr__(self):
         return f"<Issue(uuid={self.uuid}, title={self.title}, status={self.status})>"
+
+
+class IssueTag(Base):
+    """
+    One row per (issue, tag), mirroring Issue.tags for indexed tag queries.
+
+    Maintained by database triggers on `issues` (see app.api.migrations), so
+    writes only ever touch Issue.tags.
+    """
+    __tablename__ = "issue_tags"
+    issue_id = Column(Integer, ForeignKey("issues.issue_id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_issue_tags_tag", "tag", "issue_id"),
+    )
+
+
+class IssueCounter(Base):
+    """
+    Materialized issue counts per (dimension, value), e.g. ("status", "open").
+
+    Kept current by triggers on `issues` and `issue_tags` (see
+    app.api.migrations) so stats are read without scanning the table.
+    """
+    __tablename__ = "issue_counters"
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(100), primary_key=True)
+    issues = Column(Integer, nullable=False, default=0)
+    estimated_minutes = Column(Integer, nullable=False, default=0)
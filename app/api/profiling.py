@@ -0,0 +1,253 @@
+"""
+On-demand request profiling and bounded profile storage.
+
+Two profilers:
+
+- sample: a background thread snapshots every thread's stack
+  (sys._current_frames) every PROFILER_INTERVAL seconds and writes a
+  speedscope JSON file (https://www.speedscope.app), one profile per thread.
+  This covers sync endpoints, which run in threadpool workers, and the
+  event loop alike. Threads that sat in the same frame for the whole
+  request (idle workers) are dropped.
+- cprofile: deterministic cProfile of the event loop thread, saved as a
+  pstats file. Exact call counts, but work done in threadpool workers is
+  not seen and concurrent requests on the loop are included.
+
+Only one request is profiled at a time; others run normally meanwhile.
+Profiles are kept in PROFILER_DIR, oldest removed first once there are more
+than PROFILER_MAX_PROFILES of them or they exceed PROFILER_MAX_BYTES.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+from app import config
+
+
+class ProfileMode(str, Enum):
+    sample = "sample"
+    cprofile = "cprofile"
+
+
+EXTENSIONS = {
+    ProfileMode.sample: ".speedscope.json",
+    ProfileMode.cprofile: ".pstats",
+}
+
+
+class StackSampler:
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        # thread id -> list of (stack of frame indexes, weight in seconds)
+        self._samples = {}
+        self._frames = {}
+        self._thread_names = {}
+        self.started = self.stopped = 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+
+    def _frame_index(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self._frames.get(key)
+        if index is None:
+            index = self._frames[key] = len(self._frames)
+        return index
+
+    def _run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_index(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                self._samples.setdefault(thread_id, []).append((tuple(stack), weight))
+        self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+
+    def speedscope(self, name: str) -> dict:
+        frames = [None] * len(self._frames)
+        for (func, filename, line), index in self._frames.items():
+            frames[index] = {"name": func, "file": filename, "line": line}
+        profiles = []
+        for thread_id, samples in self._samples.items():
+            # Same stack in every sample: the thread was blocked the whole time
+            if len({stack for stack, _ in samples}) <= 1:
+                continue
+            profiles.append({
+                "type": "sampled",
+                "name": self._thread_names.get(thread_id, f"thread {thread_id}"),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.stopped - self.started,
+                "samples": [list(stack) for stack, _ in samples],
+                "weights": [weight for _, weight in samples],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+            "name": name,
+            "exporter": "issue-tracker",
+        }
+
+
+class ProfileStore:
+    def __init__(self, directory, max_profiles: int = 50, max_bytes: int = 100 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # profile id -> metadata, oldest first
+        self._index: "OrderedDict[str, dict]" = OrderedDict()
+        self._load_index()
+
+    def _load_index(self):
+        if not self.directory.exists():
+            return
+        entries = []
+        for meta_path in self.directory.glob("*.meta.json"):
+            try:
+                entries.append(json.loads(meta_path.read_text()))
+            except ValueError:
+                continue
+        for meta in sorted(entries, key=lambda m: m["created_at"]):
+            if (self.directory / meta["file"]).exists():
+                self._index[meta["id"]] = meta
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        meta = self._index.get(profile_id)
+        return self.directory / meta["file"] if meta else None
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        return self._index.get(profile_id)
+
+    def list(self):
+        return list(reversed(self._index.values()))
+
+    def save(self, mode: ProfileMode, write, **meta) -> dict:
+        """Store a profile; `write(path)` writes the profile data to `path`"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = uuid.uuid4().hex[:12]
+        filename = profile_id + EXTENSIONS[mode]
+        write(self.directory / filename)
+        meta = {
+            "id": profile_id,
+            "mode": mode.value,
+            "file": filename,
+            "bytes": (self.directory / filename).stat().st_size,
+            "created_at": datetime.utcnow().isoformat(),
+            **meta,
+        }
+        (self.directory / f"{profile_id}.meta.json").write_text(json.dumps(meta))
+        with self._lock:
+            self._index[profile_id] = meta
+            self._rotate()
+        return meta
+
+    def delete(self, profile_id: str) -> bool:
+        with self._lock:
+            return self._remove(profile_id)
+
+    def _remove(self, profile_id: str) -> bool:
+        meta = self._index.pop(profile_id, None)
+        if meta is None:
+            return False
+        for name in (meta["file"], f"{profile_id}.meta.json"):
+            try:
+                os.remove(self.directory / name)
+            except FileNotFoundError:
+                pass
+        return True
+
+    def _rotate(self):
+        total = sum(meta["bytes"] for meta in self._index.values())
+        while self._index and (len(self._index) > self.max_profiles or total > self.max_bytes):
+            oldest = next(iter(self._index))
+            total -= self._index[oldest]["bytes"]
+            self._remove(oldest)
+
+    def text_report(self, profile_id: str, limit: int = 40) -> Optional[str]:
+        """Top functions by cumulative time, for pstats profiles"""
+        meta = self._index.get(profile_id)
+        if meta is None or meta["mode"] != ProfileMode.cprofile.value:
+            return None
+        out = io.StringIO()
+        pstats.Stats(str(self.directory / meta["file"]), stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+class RequestProfiler:
+    """Runs one request at a time under a profiler and stores the result"""
+
+    def __init__(self, store: ProfileStore, interval: float = 0.005):
+        self.store = store
+        self.interval = interval
+        self._busy = threading.Lock()
+
+    def try_begin(self, mode: ProfileMode):
+        """Start profiling, or return None if another request is being profiled"""
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            if mode == ProfileMode.cprofile:
+                profiler = cProfile.Profile()
+                profiler.enable()
+            else:
+                profiler = StackSampler(self.interval)
+                profiler.start()
+        except Exception:
+            self._busy.release()
+            raise
+        return mode, profiler
+
+    def stop_collecting(self, session):
+        """Stop cProfile; call it from the thread that started it (cProfile is per thread)"""
+        mode, profiler = session
+        if mode == ProfileMode.cprofile:
+            profiler.disable()
+
+    def finish(self, session, **meta) -> dict:
+        """
+        Stop the sampler and write the profile, after stop_collecting(). This
+        blocks on file I/O, so async callers should run it in a thread.
+        """
+        mode, profiler = session
+        try:
+            if mode == ProfileMode.cprofile:
+                return self.store.save(mode, lambda path: profiler.dump_stats(str(path)), **meta)
+            profiler.stop()
+            data = profiler.speedscope(f"{meta.get('method')} {meta.get('path')}")
+            return self.store.save(mode, lambda path: path.write_text(json.dumps(data)), **meta)
+        finally:
+            self._busy.release()
+
+
+profile_store = ProfileStore(config.PROFILER_DIR, config.PROFILER_MAX_PROFILES, config.PROFILER_MAX_BYTES)
+request_profiler = RequestProfiler(profile_store, config.PROFILER_INTERVAL)
@@ -0,0 +1,202 @@
+"""
+Shared filtering and keyset pagination for issue list queries.
+
+Works on plain `select()` statements so the same filters can back any route
+that lists issues.
+"""
+import base64
+import binascii
+import json
+import re
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from fastapi import Query
+from sqlalchemy import select, func, tuple_, table, column, literal_column
+
+from app.api.models import Issue, IssueTag
+from app.api.schemas import IssueFilters, IssuePriority, IssueStatus, TagMode
+
+
+class IssueSort(str, Enum):
+    id = "id"
+    created = "created"
+    updated = "updated"
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# Columns making up the keyset for each sort; issue_id always breaks ties
+_SORT_COLUMNS = {
+    IssueSort.id: (Issue.issue_id,),
+    IssueSort.created: (Issue.created_at, Issue.issue_id),
+    IssueSort.updated: (Issue.updated_at, Issue.issue_id),
+}
+
+
+def issue_filters(
+        status: Optional[List[IssueStatus]] = Query(None),
+        priority: Optional[List[IssuePriority]] = Query(None),
+        tag: Optional[List[str]] = Query(None, description="Repeat for several tags"),
+        tag_mode: TagMode = TagMode.any,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None):
+    """Dependency collecting the list filters from the query string"""
+    return IssueFilters(
+        status=status,
+        priority=priority,
+        tags=tag,
+        tag_mode=tag_mode,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+
+def tagged_issue_ids(tags: List[str], mode: TagMode = TagMode.any):
+    """Subquery of issue ids carrying any/all of the tags, served by ix_issue_tags_tag"""
+    tags = sorted(set(tags))
+    stmt = select(IssueTag.issue_id).where(IssueTag.tag.in_(tags))
+    if mode == TagMode.all and len(tags) > 1:
+        stmt = stmt.group_by(IssueTag.issue_id).having(func.count() == len(tags))
+    return stmt
+
+
+def apply_filters(stmt, filters: IssueFilters):
+    if filters.status:
+        stmt = stmt.where(Issue.status.in_([s.value for s in filters.status]))
+    if filters.priority:
+        stmt = stmt.where(Issue.priority.in_([p.value for p in filters.priority]))
+    if filters.tags:
+        stmt = stmt.where(Issue.issue_id.in_(tagged_issue_ids(filters.tags, filters.tag_mode)))
+    if filters.created_after:
+        stmt = stmt.where(Issue.created_at >= filters.created_after)
+    if filters.created_before:
+        stmt = stmt.where(Issue.created_at < filters.created_before)
+    if filters.updated_after:
+        stmt = stmt.where(Issue.updated_at >= filters.updated_after)
+    if filters.updated_before:
+        stmt = stmt.where(Issue.updated_at < filters.updated_before)
+    return stmt
+
+
+def encode_cursor(issue: Issue, sort: IssueSort, order: SortOrder) -> str:
+    values = []
+    for column in _SORT_COLUMNS[sort]:
+        value = getattr(issue, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    raw = json.dumps({"s": sort.value, "o": order.value, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: IssueSort, order: SortOrder) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values = data["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+
+    if data.get("s") != sort.value or data.get("o") != order.value:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+
+    columns = _SORT_COLUMNS[sort]
+    if len(values) != len(columns):
+        raise InvalidCursor("Malformed cursor")
+    try:
+        return [
+            datetime.fromisoformat(v) if column.key.endswith("_at") else int(v)
+            for column, v in zip(columns, values)
+        ]
+    except (TypeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+
+
+def apply_keyset(stmt, sort: IssueSort, order: SortOrder, cursor: Optional[str] = None):
+    """Order the statement by the sort keyset and start after the cursor row"""
+    columns = _SORT_COLUMNS[sort]
+    if cursor:
+        values = decode_cursor(cursor, sort, order)
+        if len(columns) > 1:
+            key, after = tuple_(*columns), tuple(values)
+        else:
+            key, after = columns[0], values[0]
+        stmt = stmt.where(key > after if order == SortOrder.asc else key < after)
+
+    if order == SortOrder.asc:
+        return stmt.order_by(*columns)
+    return stmt.order_by(*(c.desc() for c in columns))
+
+
+def finish_page(issues, limit, sort: IssueSort, order: SortOrder, request, response):
+    """
+    Trim a page fetched with limit + 1 rows and set the next-page headers.
+
+    The extra row only signals that another page exists.
+    """
+    if len(issues) <= limit:
+        return issues
+    issues = issues[:limit]
+    next_cursor = encode_cursor(issues[-1], sort, order)
+    response.headers["X-Next-Cursor"] = next_cursor
+    next_url = request.url.remove_query_params("skip").include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return issues
+
+
+# FTS5 external-content table maintained by migration 2
+_issues_fts = table("issues_fts", column("rowid"))
+# bm25 column weights: title, description, root_cause_hint (lower rank = better match)
+_fts_rank = literal_column("bm25(issues_fts, 10.0, 1.0, 2.0)")
+# Best-matching fragment from any column, terms wrapped in markdown bold
+_fts_snippet = literal_column("snippet(issues_fts, -1, '**', '**', '…', 16)")
+
+_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_match_query(q: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every word is quoted (so FTS5 operators and punctuation in user input
+    can't cause syntax errors) and all words must match; the last word also
+    matches as a prefix so partially typed terms still find results.
+    """
+    tokens = _FTS_TOKEN.findall(q)
+    if not tokens:
+        return None
+    terms = [f'"{t}"' for t in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_statement(match: str, limit: int, offset: int = 0):
+    """Select (Issue, rank, snippet) rows for an FTS5 match, best first"""
+    return (
+        select(Issue, _fts_rank.label("rank"), _fts_snippet.label("snippet"))
+        .join(_issues_fts, _issues_fts.c.rowid == Issue.issue_id)
+        .where(literal_column("issues_fts").op("MATCH")(match))
+        .order_by(_fts_rank)
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+def tag_counts_statement(filters: IssueFilters, limit: int):
+    """Tag facet counts over the issues matching the filters, most used first"""
+    count = func.count().label("count")
+    stmt = select(IssueTag.tag, count).group_by(IssueTag.tag).order_by(count.desc(), IssueTag.tag).limit(limit)
+    if filters.model_dump(exclude_defaults=True):
+        stmt = stmt.where(IssueTag.issue_id.in_(apply_filters(select(Issue.issue_id), filters)))
+    return stmt
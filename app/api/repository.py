@@ -0,0 +1,391 @@
+"""
+Issue repositories: one interface over the different issue stores.
+
+Repositories take IssueCreate / validated update dicts and return
+IssueResponse models, so callers do not depend on how or where issues are
+stored. List filtering, sorting and cursors follow GET /issues
+(app.api.queries).
+
+ISSUE_BACKEND selects the implementation the routes use:
+
+- sqlalchemy: the `issues` table (default; needed for search, tags, stats,
+  export and import)
+- file: in-memory indexes persisted to an append-only log (app.api.storage)
+- memory: in-memory only, for ephemeral environments and load tests
+"""
+import logging
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Protocol, Optional, List, Dict
+
+from pydantic import ValidationError
+from sqlalchemy import select, delete, insert, update, func
+from sqlalchemy.orm import Session
+
+from app import config
+from app.api.Database import SessionLocal
+from app.api.models import Issue
+from app.api.queries import IssueSort, SortOrder, decode_cursor, apply_filters, apply_keyset
+from app.api.schemas import IssueCreate, IssueResponse, IssueFilters, TagMode
+from app.api.storage import LogStore
+
+logger = logging.getLogger(__name__)
+
+
+class VersionConflict(Exception):
+    """The issue exists but its updated_at is not one of the expected versions"""
+
+
+class IssueRepository(Protocol):
+    def get(self, issue_id: int) -> Optional[IssueResponse]: ...
+
+    def list(self, filters: IssueFilters, sort: IssueSort = IssueSort.id, order: SortOrder = SortOrder.asc,
+             limit: int = 100, skip: int = 0, cursor: Optional[str] = None) -> List[IssueResponse]: ...
+
+    def create(self, issue: IssueCreate) -> IssueResponse: ...
+
+    def create_many(self, issues: List[IssueCreate]) -> List[IssueResponse]: ...
+
+    def update(self, issue_id: int, changes: dict,
+               expected: Optional[List[datetime]] = None) -> Optional[IssueResponse]: ...
+
+    def update_many(self, issue_ids: List[int], changes: dict) -> List[IssueResponse]: ...
+
+    def delete(self, issue_id: int) -> bool: ...
+
+    def count(self) -> int: ...
+
+
+def matches(issue: IssueResponse, filters: IssueFilters) -> bool:
+    """Python equivalent of queries.apply_filters for one issue"""
+    if filters.status and issue.status not in filters.status:
+        return False
+    if filters.priority and issue.priority not in filters.priority:
+        return False
+    if filters.tags:
+        found = set(filters.tags).intersection(issue.tags)
+        if not found or (filters.tag_mode == TagMode.all and len(found) < len(set(filters.tags))):
+            return False
+    if filters.created_after and issue.created_at < filters.created_after:
+        return False
+    if filters.created_before and issue.created_at >= filters.created_before:
+        return False
+    if filters.updated_after and issue.updated_at < filters.updated_after:
+        return False
+    if filters.updated_before and issue.updated_at >= filters.updated_before:
+        return False
+    return True
+
+
+def sort_key(sort: IssueSort):
+    """Keyset tuple for a sort, matching queries._SORT_COLUMNS"""
+    if sort == IssueSort.created:
+        return lambda issue: (issue.created_at, issue.issue_id)
+    if sort == IssueSort.updated:
+        return lambda issue: (issue.updated_at, issue.issue_id)
+    return lambda issue: (issue.issue_id,)
+
+
+class SqlAlchemyIssueRepository:
+    """Issues in the database, through one request-scoped Session"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, issue_id: int) -> Optional[IssueResponse]:
+        db_issue = self.db.get(Issue, issue_id)
+        return IssueResponse.model_validate(db_issue) if db_issue else None
+
+    def list(self, filters: IssueFilters, sort: IssueSort = IssueSort.id, order: SortOrder = SortOrder.asc,
+             limit: int = 100, skip: int = 0, cursor: Optional[str] = None) -> List[IssueResponse]:
+        stmt = apply_keyset(apply_filters(select(Issue), filters), sort, order, cursor)
+        if skip and not cursor:
+            stmt = stmt.offset(skip)
+        return [IssueResponse.model_validate(i) for i in self.db.scalars(stmt.limit(limit))]
+
+    def create(self, issue: IssueCreate) -> IssueResponse:
+        db_issue = Issue(**issue.model_dump())
+        self.db.add(db_issue)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(db_issue)
+        return IssueResponse.model_validate(db_issue)
+
+    def create_many(self, issues: List[IssueCreate]) -> List[IssueResponse]:
+        """One multi-row INSERT ... RETURNING in a single transaction"""
+        if not issues:
+            return []
+        try:
+            created = self.db.scalars(
+                insert(Issue).returning(Issue, sort_by_parameter_order=True),
+                [issue.model_dump() for issue in issues]
+            ).all()
+            # Serialize before commit expires the returned objects
+            results = [IssueResponse.model_validate(db_issue) for db_issue in created]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return results
+
+    def update(self, issue_id: int, changes: dict,
+               expected: Optional[List[datetime]] = None) -> Optional[IssueResponse]:
+        """
+        One UPDATE ... RETURNING. With `expected`, the row is only changed if
+        its updated_at is one of those values, checked in the same statement.
+        """
+        stmt = update(Issue).where(Issue.issue_id == issue_id)
+        if expected is not None:
+            stmt = stmt.where(Issue.updated_at.in_(expected))
+        try:
+            db_issue = self.db.scalars(
+                stmt.values(**changes, updated_at=datetime.utcnow()).returning(Issue)
+            ).one_or_none()
+            result = IssueResponse.model_validate(db_issue) if db_issue else None
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        if result is None and expected is not None and self.db.get(Issue, issue_id) is not None:
+            raise VersionConflict(f"Issue {issue_id} has been modified")
+        return result
+
+    def update_many(self, issue_ids: List[int], changes: dict) -> List[IssueResponse]:
+        """The same changes for every id, as one UPDATE ... WHERE issue_id IN (...)"""
+        if not issue_ids:
+            return []
+        try:
+            updated = self.db.scalars(
+                update(Issue).where(Issue.issue_id.in_(issue_ids))
+                .values(**changes, updated_at=datetime.utcnow()).returning(Issue)
+            ).all()
+            results = [IssueResponse.model_validate(db_issue) for db_issue in updated]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return results
+
+    def delete(self, issue_id: int) -> bool:
+        # Single DELETE instead of load-then-delete
+        try:
+            deleted = self.db.execute(delete(Issue).where(Issue.issue_id == issue_id)).rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return deleted > 0
+
+    def count(self) -> int:
+        return self.db.scalar(select(func.count()).select_from(Issue))
+
+
+class InMemoryIssueRepository:
+    """
+    Issues in a dict, plus one sorted list of keyset tuples per IssueSort.
+
+    Listing walks the sorted list from the cursor position (found with
+    bisect) and stops once the page is full, so a page costs O(log N + rows
+    scanned) rather than a full sort.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._issues: Dict[int, IssueResponse] = {}
+        self._indexes = {sort: [] for sort in IssueSort}
+        self._keys = {sort: sort_key(sort) for sort in IssueSort}
+        self._next_id = 1
+
+    def _load(self, issues):
+        """Replace the contents, building each index with one sort"""
+        self._issues = {issue.issue_id: issue for issue in issues}
+        for sort, key in self._keys.items():
+            self._indexes[sort] = sorted(key(issue) for issue in self._issues.values())
+        self._next_id = max(self._issues, default=0) + 1
+
+    def _index(self, issue: IssueResponse):
+        for sort, key in self._keys.items():
+            insort(self._indexes[sort], key(issue))
+
+    def _unindex(self, issue: IssueResponse):
+        for sort, key in self._keys.items():
+            keys = self._indexes[sort]
+            del keys[bisect_left(keys, key(issue))]
+
+    # Persistence hooks, called with the lock held: _persist* before memory
+    # is changed, _after_write once it has been
+    def _persist(self, issue: IssueResponse):
+        pass
+
+    def _persist_delete(self, issue_id: int):
+        pass
+
+    def _after_write(self):
+        pass
+
+    def get(self, issue_id: int) -> Optional[IssueResponse]:
+        return self._issues.get(issue_id)
+
+    def list(self, filters: IssueFilters, sort: IssueSort = IssueSort.id, order: SortOrder = SortOrder.asc,
+             limit: int = 100, skip: int = 0, cursor: Optional[str] = None) -> List[IssueResponse]:
+        after = tuple(decode_cursor(cursor, sort, order)) if cursor else None
+        page = []
+        with self._lock:
+            keys = self._indexes[sort]
+            if order == SortOrder.asc:
+                start = bisect_right(keys, after) if after else 0
+                positions = range(start, len(keys))
+            else:
+                end = bisect_left(keys, after) if after else len(keys)
+                positions = range(end - 1, -1, -1)
+            to_skip = 0 if cursor else skip
+            for position in positions:
+                issue = self._issues[keys[position][-1]]
+                if not matches(issue, filters):
+                    continue
+                if to_skip:
+                    to_skip -= 1
+                    continue
+                page.append(issue)
+                if len(page) >= limit:
+                    break
+        return page
+
+    def create(self, issue: IssueCreate) -> IssueResponse:
+        return self.create_many([issue])[0]
+
+    def create_many(self, issues: List[IssueCreate]) -> List[IssueResponse]:
+        with self._lock:
+            now = datetime.utcnow()
+            created = []
+            for issue in issues:
+                new = IssueResponse(issue_id=self._next_id, created_at=now, updated_at=now, **issue.model_dump())
+                self._persist(new)
+                self._issues[new.issue_id] = new
+                self._index(new)
+                self._next_id += 1
+                created.append(new)
+            self._after_write()
+            return created
+
+    def _apply_update(self, existing: IssueResponse, changes: dict, now: datetime) -> IssueResponse:
+        updated = IssueResponse.model_validate({**existing.model_dump(), **changes, "updated_at": now})
+        self._persist(updated)
+        self._unindex(existing)
+        self._issues[existing.issue_id] = updated
+        self._index(updated)
+        return updated
+
+    def update(self, issue_id: int, changes: dict,
+               expected: Optional[List[datetime]] = None) -> Optional[IssueResponse]:
+        with self._lock:
+            existing = self._issues.get(issue_id)
+            if existing is None:
+                return None
+            if expected is not None and existing.updated_at not in expected:
+                raise VersionConflict(f"Issue {issue_id} has been modified")
+            updated = self._apply_update(existing, changes, datetime.utcnow())
+            self._after_write()
+            return updated
+
+    def update_many(self, issue_ids: List[int], changes: dict) -> List[IssueResponse]:
+        with self._lock:
+            now = datetime.utcnow()
+            updated = [
+                self._apply_update(self._issues[issue_id], changes, now)
+                for issue_id in dict.fromkeys(issue_ids) if issue_id in self._issues
+            ]
+            self._after_write()
+            return updated
+
+    def delete(self, issue_id: int) -> bool:
+        with self._lock:
+            existing = self._issues.get(issue_id)
+            if existing is None:
+                return False
+            self._persist_delete(issue_id)
+            self._unindex(existing)
+            del self._issues[issue_id]
+            self._after_write()
+            return True
+
+    def count(self) -> int:
+        return len(self._issues)
+
+
+class FileIssueRepository(InMemoryIssueRepository):
+    """
+    InMemoryIssueRepository persisted to an append-only LogStore.
+
+    Every write is appended (and fsynced) before it is applied in memory;
+    the log is compacted into a snapshot every `compact_every` writes.
+    """
+
+    def __init__(self, store: Optional[LogStore] = None):
+        super().__init__()
+        self.store = store or LogStore()
+        now = datetime.utcnow().isoformat()
+        issues = []
+        stamped = False
+        for key, record in self.store.load().items():
+            if "created_at" not in record or "updated_at" not in record:
+                # Imported before legacy records were stamped; fixed below so the
+                # timestamps (sort order, ETags) do not change on every load
+                record = {"created_at": now, "updated_at": record.get("created_at", now), **record}
+                stamped = True
+            try:
+                issues.append(IssueResponse.model_validate(record))
+            except ValidationError as e:
+                logger.warning("Skipping invalid stored issue %s: %s", key, e)
+        self._load(issues)
+        if stamped:
+            self.store.compact(issue.model_dump(mode="json") for issue in self._issues.values())
+
+    def _persist(self, issue: IssueResponse):
+        self.store.put(issue.model_dump(mode="json"))
+
+    def _persist_delete(self, issue_id: int):
+        self.store.delete(issue_id)
+
+    def _after_write(self):
+        if self.store.needs_compaction():
+            self.store.compact(issue.model_dump(mode="json") for issue in self._issues.values())
+
+    def close(self):
+        self.store.close()
+
+
+_shared_repository = None
+_shared_lock = threading.Lock()
+
+
+def shared_repository():
+    """The process-wide file or memory repository for ISSUE_BACKEND"""
+    global _shared_repository
+    with _shared_lock:
+        if _shared_repository is None:
+            if config.ISSUE_BACKEND == "file":
+                _shared_repository = FileIssueRepository()
+            else:
+                _shared_repository = InMemoryIssueRepository()
+        return _shared_repository
+
+
+def uses_database() -> bool:
+    return config.ISSUE_BACKEND == "sqlalchemy"
+
+
+def get_repository():
+    """Dependency yielding the repository for ISSUE_BACKEND; only sqlalchemy opens a session"""
+    if not uses_database():
+        yield shared_repository()
+        return
+    db = SessionLocal()
+    try:
+        yield SqlAlchemyIssueRepository(db)
+    finally:
+        db.close()
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app import config
+from app.api.middleware.profiler import is_admin
+from app.api.profiling import profile_store
+
+def require_admin(request: Request):
+    if not config.ADMIN_TOKEN:
+        # Hide the admin surface entirely when no token is configured
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not is_admin(request):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+def list_profiles():
+    """Stored request profiles, newest first"""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, view: str = "file"):
+    """
+    Download a profile: speedscope JSON (open at https://www.speedscope.app)
+    or a pstats file. For pstats profiles ?view=text returns the top
+    functions by cumulative time.
+    """
+    meta = profile_store.get(profile_id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if view == "text":
+        report = profile_store.text_report(profile_id)
+        if report is None:
+            raise HTTPException(status_code=400, detail="Text view is only available for cprofile profiles")
+        return PlainTextResponse(report)
+    media_type = "application/json" if meta["mode"] == "sample" else "application/octet-stream"
+    return FileResponse(profile_store.path(profile_id), media_type=media_type, filename=meta["file"])
+
+
+@router.delete("/profiles/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_profile(profile_id: str):
+    if not profile_store.delete(profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return None
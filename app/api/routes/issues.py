@@ -1,14 +1,34 @@
+import asyncio
+import io
 import json
-from datetime import datetime
-from typing import List
+import tempfile
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.agent.core import AgentService
-from app.api.Database import init_db, get_db
-from app.api.models import Issue
-from app.api.schemas import IssueUpdate, IssueCreate, IssueResponse
+from app import config
+from app.metrics import span
+
+from app.agent.core import AgentService, AgentBusyError
+from app.api.Database import init_db, get_db, engine
+from app.api.cache import response_cache, issue_etag, if_match_versions, issue_response
+from app.api.events import event_bus, OffsetExpired
+from app.api.export import ExportFormat, MEDIA_TYPES, stream_export
+from app.api.importer import ImportFormat, import_issues
+from app.api.queries import (
+    IssueSort, SortOrder, InvalidCursor, issue_filters, finish_page,
+    fts_match_query, search_statement, tag_counts_statement
+)
+from app.api.repository import IssueRepository, VersionConflict, get_repository, uses_database
+from app.api.schemas import (
+    IssueUpdate, IssueCreate, IssueResponse, IssueFilters, BatchItemResult, BatchCreateResponse,
+    SearchHit, SearchResponse, TagCount, IssueStats, ImportReport, IssueBulkUpdate, BulkUpdateResponse
+)
+from app.api.stats import compute_stats
 
 # from app.storage import load_data,save_data
 router = APIRouter(prefix="/api/issues" ,tags=["Issues"])
@@ -17,43 +37,73 @@ agent = AgentService()
 
 @router.on_event("startup")
 def startup_event():
-    init_db()
+    if uses_database():
+        init_db()
+
+def require_database():
+    """Dependency for routes that need SQL (FTS, aggregates, streaming)"""
+    if not uses_database():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Not available with ISSUE_BACKEND={config.ISSUE_BACKEND}"
+        )
+
+def _agent_busy(e: AgentBusyError):
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Agent is busy: {str(e)}",
+        headers={"Retry-After": "5"}
+    )
+
+def _cache_bypass(x_cache_bypass: Optional[str], cache_control: Optional[str]) -> bool:
+    return (x_cache_bypass or "").lower() in ("1", "true", "yes") \
+        or "no-cache" in (cache_control or "").lower()
 
 @router.post("/issues", status_code=status.HTTP_201_CREATED, response_model=IssueResponse)
-def create_issue(query:str,db:Session = Depends(get_db)):
+async def create_issue(
+        query:str,
+        response: Response,
+        repo: IssueRepository = Depends(get_repository),
+        x_cache_bypass: Optional[str] = Header(None),
+        cache_control: Optional[str] = Header(None)):
     """
     Create an issue using natural language query.
 
     Args:
         query: Natural language description (e.g., "Website giving 502 error, high priority")
-        db: Database session
+        repo: Issue repository
+        x_cache_bypass: Send "1"/"true" (or Cache-Control: no-cache) to skip the semantic cache
 
     Returns:
         Created issue object
     """
 
     try:
-        agent_response = agent.process_chat(
-            user_input=query,
-            chat_history=[]
+        agent_response = await agent.aprocess_create(
+            query, use_cache=not _cache_bypass(x_cache_bypass, cache_control)
         )
+        if agent_response.get("cache"):
+            response.headers["X-Cache"] = agent_response["cache"].upper()
 
         if not agent_response.get("tool_result"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Could not extract issue details from query. Please be more specific."
             )
-        issue_data = json.loads(agent_response["tool_result"])
-
-        issue = IssueCreate(**issue_data)
-
-        db_issue = Issue(**issue.dict())
-        db.add(db_issue)
-        db.commit()
-        db.refresh(db_issue)
-
-        return db_issue
-
+        with span("decode"):
+            issue_data = json.loads(agent_response["tool_result"])
+        with span("validate"):
+            issue = IssueCreate(**issue_data)
+        with span("db"):
+            created = await run_in_threadpool(repo.create, issue)
+        response_cache.invalidate()
+        event_bus.publish("created", created.issue_id, created)
+        return created
+
+    except HTTPException:
+        raise
+    except AgentBusyError as e:
+        raise _agent_busy(e)
     except json.JSONDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -65,7 +115,6 @@ def create_issue(query:str,db:Session = Depends(get_db)):
             detail=f"Validation error: {str(e)}"
         )
     except Exception as e:
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating issue: {str(e)}"
@@ -76,14 +125,254 @@ def create_issue(query:str,db:Session = Depends(get_db)):
 
     pass
 
+def _parse_batch_body(body: bytes, content_type: str):
+    """Return a list of queries (or Exceptions for unreadable NDJSON lines)"""
+    def as_query(item):
+        if isinstance(item, dict):
+            item = item.get("query")
+        if not isinstance(item, str) or not item.strip():
+            raise ValueError("Each item must be a non-empty string or an object with a 'query' field")
+        return item.strip()
+
+    def parse_line(line):
+        try:
+            return as_query(json.loads(line))
+        except ValueError as e:
+            return e
+
+    def parse_item(item):
+        try:
+            return as_query(item)
+        except ValueError as e:
+            return e
+
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        return [parse_line(line) for line in body.decode().splitlines() if line.strip()]
+
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array of queries")
+    return [parse_item(item) for item in items]
+
+
+@router.post("/issues/batch", status_code=status.HTTP_200_OK, response_model=BatchCreateResponse)
+async def create_issues_batch(request: Request, repo: IssueRepository = Depends(get_repository)):
+    """
+    Create many issues from natural language queries in one request.
+
+    Body is either a JSON array (["Website giving 502", {"query": "..."}]) or
+    NDJSON (Content-Type: application/x-ndjson), one query per line. Queries
+    are extracted concurrently, every valid result is inserted in a single
+    transaction, and per-item results/errors are returned in input order.
+    """
+    try:
+        queries = _parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid batch body: {str(e)}"
+        )
+    if len(queries) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large: {len(queries)} items (max {config.BATCH_MAX_ITEMS})"
+        )
+
+    slots = asyncio.Semaphore(config.BATCH_MAX_PARALLEL)
+
+    async def extract(query):
+        if isinstance(query, Exception):
+            raise query
+        async with slots:
+            agent_response = await agent.aprocess_create(query)
+        if not agent_response.get("tool_result"):
+            raise ValueError("Could not extract issue details from query")
+        return IssueCreate(**json.loads(agent_response["tool_result"]))
+
+    extracted = await asyncio.gather(*(extract(q) for q in queries), return_exceptions=True)
+
+    results = [None] * len(queries)
+    rows, row_indexes = [], []
+    for index, (query, issue) in enumerate(zip(queries, extracted)):
+        query = query if isinstance(query, str) else None
+        if isinstance(issue, Exception):
+            results[index] = BatchItemResult(index=index, query=query, ok=False, error=str(issue))
+        else:
+            rows.append(issue)
+            row_indexes.append(index)
+
+    if rows:
+        try:
+            created = await run_in_threadpool(repo.create_many, rows)
+            for index, issue in zip(row_indexes, created):
+                results[index] = BatchItemResult(index=index, query=queries[index], ok=True, issue=issue)
+            response_cache.invalidate()
+            for issue in created:
+                event_bus.publish("created", issue.issue_id, issue)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating issues: {str(e)}"
+            )
+
+    return BatchCreateResponse(created=len(rows), failed=len(queries) - len(rows), results=results)
+
+
+@router.post("/import", response_model=ImportReport, dependencies=[Depends(require_database)])
+async def import_issues_file(
+        request: Request,
+        format: ImportFormat = ImportFormat.json,
+        chunk_size: int = Query(5000, ge=1, le=100_000)):
+    """
+    Bulk import structured issues from the raw request body (JSON array,
+    NDJSON or CSV), without going through the agent.
+
+    The body is spooled to a temporary file and imported in chunked
+    transactions; invalid records are reported as rejects.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        try:
+            report = await run_in_threadpool(import_issues, engine, text, format, chunk_size)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {format.value} body: {e}")
+        finally:
+            text.detach()
+            # Chunks committed before a parse error are kept
+            response_cache.invalidate()
+            # Too many rows for per-issue events; live clients reload instead
+            event_bus.publish("reset")
+    return report
+
+
 @router.get("/issues", response_model=List[IssueResponse])
-def get_issues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    issues = db.query(Issue).offset(skip).limit(limit).all()
-    return issues
+def get_issues(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        sort: IssueSort = IssueSort.id,
+        order: SortOrder = SortOrder.asc,
+        filters: IssueFilters = Depends(issue_filters),
+        repo: IssueRepository = Depends(get_repository)):
+    """
+    List issues with server-side filtering and keyset pagination.
+
+    Pass the X-Next-Cursor response header back as `cursor` (with the same
+    sort/order) to fetch the next page; it is absent on the last page.
+    `skip` still works for offset paging but gets slower at deep pages.
+
+    Responses carry a weak ETag; send it back in If-None-Match to get a 304
+    while no issue has changed. X-Event-Offset is the change feed position
+    (see /events) the page is at least as new as.
+    """
+    # Read before the query: replaying events already reflected in the page is harmless
+    event_offset = event_bus.token()
+    cached, token = response_cache.lookup(request)
+    if cached:
+        cached.headers["X-Event-Offset"] = event_offset
+        return cached
+
+    try:
+        issues = repo.list(filters, sort, order, limit=limit + 1, skip=skip, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    issues = finish_page(issues, limit, sort, order, request, response)
+    rendered = response_cache.render(token, List[IssueResponse], issues, response)
+    rendered.headers["X-Event-Offset"] = event_offset
+    return rendered
+
+
+@router.get("/export", dependencies=[Depends(require_database)])
+def export_issues(
+        format: ExportFormat = ExportFormat.ndjson,
+        filters: IssueFilters = Depends(issue_filters)):
+    """
+    Stream every issue matching the list filters as NDJSON or CSV.
+
+    Rows are read with a server-side cursor, so memory stays flat however
+    many issues are exported. CSV joins tags with ";".
+    """
+    return StreamingResponse(
+        stream_export(engine, filters, format, config.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="issues.{format.value}"'},
+    )
+
+
+@router.get("/tags", response_model=List[TagCount], dependencies=[Depends(require_database)])
+def get_tag_counts(
+        request: Request,
+        limit: int = Query(100, ge=1, le=1000),
+        filters: IssueFilters = Depends(issue_filters),
+        db: Session = Depends(get_db)):
+    """
+    Tag facet counts, most used first.
+
+    Accepts the same filters as GET /issues, so e.g. ?status=open counts
+    tags on open issues only.
+    """
+    cached, token = response_cache.lookup(request)
+    if cached:
+        return cached
+    rows = db.execute(tag_counts_statement(filters, limit)).all()
+    return response_cache.render(token, List[TagCount], [TagCount(tag=tag, count=count) for tag, count in rows])
+
+
+@router.get("/stats", response_model=IssueStats, dependencies=[Depends(require_database)])
+def get_issue_stats(request: Request, tag_limit: int = Query(50, ge=1, le=1000), db: Session = Depends(get_db)):
+    """
+    Issue counts by status, priority and tag, open-issue age buckets and
+    summed estimated_minutes.
+
+    On SQLite the counts are read from trigger-maintained counters, so the
+    cost does not grow with the number of issues.
+    """
+    cached, token = response_cache.lookup(request)
+    if cached:
+        return cached
+    return response_cache.render(token, IssueStats, compute_stats(db, tag_limit))
+
+
+@router.get("/search", response_model=SearchResponse, dependencies=[Depends(require_database)])
+def search_issues(
+        q: str = Query(..., min_length=1),
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+        db: Session = Depends(get_db)):
+    """
+    Full-text search over title, description and root_cause_hint.
+
+    Results are ranked by bm25 (title matches weigh most) and carry a
+    highlighted snippet. Use next_offset to fetch the following page.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Full-text search requires the SQLite FTS5 backend"
+        )
+    match = fts_match_query(q)
+    if match is None:
+        return SearchResponse(query=q, results=[])
+
+    rows = db.execute(search_statement(match, limit + 1, offset)).all()
+    results = [
+        SearchHit(issue=IssueResponse.model_validate(issue), rank=rank, snippet=snippet)
+        for issue, rank, snippet in rows[:limit]
+    ]
+    return SearchResponse(
+        query=q,
+        results=results,
+        next_offset=offset + limit if len(rows) > limit else None
+    )
 
 
 @router.put("/issue/", response_model=IssueResponse)
-def update_issue( query: str,db: Session = Depends(get_db)):
+async def update_issue( query: str, repo: IssueRepository = Depends(get_repository)):
     """
     Update an issue using natural language.
 
@@ -94,7 +383,7 @@ def update_issue( query: str,db: Session = Depends(get_db)):
     """
     # issue_id: str, issue_update: IssueUpdate,
     try :
-        agent_response= agent.process_chat(user_input=query,chat_history=[])
+        agent_response = await agent.aprocess_update(query)
         print(agent_response)
         if not agent_response.get("tool_result"):
             raise HTTPException(
@@ -102,18 +391,25 @@ def update_issue( query: str,db: Session = Depends(get_db)):
                 detail="Agent did not return update data."
             )
 
-        issue_data = json.loads(agent_response["tool_result"])
-        db_issue = db.query(Issue).filter(Issue.issue_id == issue_data["issue_id"]).first()
-        if not db_issue:
-            raise HTTPException(status_code=404, detail="Issue not found")
-        update_data = issue_data["updates"]
+        with span("decode"):
+            issue_data = json.loads(agent_response["tool_result"])
+        with span("validate"):
+            update_data = IssueUpdate(**issue_data["updates"]).model_dump(exclude_unset=True, mode="json")
         print(update_data)
-        for field, value in update_data.items():
-            setattr(db_issue, field, value)
-        db_issue.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(db_issue)
-        return db_issue
+        with span("db"):
+            updated = await run_in_threadpool(repo.update, issue_data["issue_id"], update_data)
+        if not updated:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        response_cache.invalidate()
+        event_bus.publish("updated", updated.issue_id, updated)
+        return updated
+    except AgentBusyError as e:
+        raise _agent_busy(e)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Validation error: {str(e)}"
+        )
     except json.JSONDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -136,24 +432,157 @@ def update_issue( query: str,db: Session = Depends(get_db)):
     # return db_issue
 
 
-# Delete issue
-@router.delete("/issues/{issue_uuid}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_issue(issue_uuid: str, db: Session = Depends(get_db)):
-    db_issue = db.query(Issue).filter(Issue.issue_id == issue_uuid).first()
-    if not db_issue:
+def _event_offset(token: Optional[str]) -> int:
+    """Offset to resume after; the current one when no token is given"""
+    if not token:
+        return event_bus.offset
+    try:
+        offset = event_bus.parse_token(token)
+        event_bus.since(offset)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except OffsetExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    return offset
+
+def _sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+@router.get("/events")
+async def issue_events(request: Request, after: Optional[str] = None, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of issue changes (created, updated, deleted, reset).
+
+    Resumes after `after` or the Last-Event-ID header (an X-Event-Offset /
+    event id token); without either it starts with the next change. 410 when
+    that position has left the buffer: reload the list and resume from its
+    X-Event-Offset. A consumer that falls behind mid-stream gets a `reset`.
+    """
+    offset = _event_offset(after or last_event_id)
+
+    async def stream():
+        yield "retry: 3000\n\n"
+        try:
+            async for events in event_bus.subscribe(offset, config.EVENTS_HEARTBEAT):
+                if not events:
+                    yield ": keep-alive\n\n"
+                for event in events:
+                    yield _sse(event)
+        except OffsetExpired:
+            yield _sse({"id": event_bus.token(), "type": "reset"})
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/events/since")
+def issue_events_since(after: str):
+    """Changes after `after` as JSON, for clients that poll instead of holding a stream"""
+    events = event_bus.since(_event_offset(after))
+    return {"offset": events[-1]["id"] if events else after, "events": events}
+
+@router.websocket("/ws")
+async def issue_events_ws(websocket: WebSocket, after: Optional[str] = None):
+    """WebSocket version of /events: one JSON event per message, heartbeats while idle"""
+    await websocket.accept()
+    try:
+        offset = event_bus.parse_token(after) if after else event_bus.offset
+        async for events in event_bus.subscribe(offset, config.EVENTS_HEARTBEAT):
+            if not events:
+                await websocket.send_json({"id": event_bus.token(), "type": "heartbeat"})
+            for event in events:
+                await websocket.send_json(event)
+    except (OffsetExpired, ValueError) as e:
+        await websocket.send_json({"id": event_bus.token(), "type": "reset", "detail": str(e)})
+        await websocket.close(code=4410)
+    except WebSocketDisconnect:
+        pass
+
+def _precondition_failed():
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Issue has been modified; fetch it again and retry with the new ETag"
+    )
+
+@router.patch("/issues", response_model=BulkUpdateResponse)
+def patch_issues(body: IssueBulkUpdate, repo: IssueRepository = Depends(get_repository)):
+    """
+    Apply the same partial update to many issues in one statement.
+
+    Ids that do not exist are returned in `missing`; the rest are updated.
+    """
+    update_data = body.changes.model_dump(exclude_unset=True, mode="json")
+    if not update_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+    ids = list(dict.fromkeys(body.ids))
+    if len(ids) > config.BULK_UPDATE_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many ids: {len(ids)} (max {config.BULK_UPDATE_MAX_IDS})"
+        )
+    with span("db"):
+        updated = repo.update_many(ids, update_data)
+    if updated:
+        response_cache.invalidate()
+        for issue in updated:
+            event_bus.publish("updated", issue.issue_id, issue)
+    found = {issue.issue_id for issue in updated}
+    return BulkUpdateResponse(updated=len(updated), missing=[i for i in ids if i not in found], issues=updated)
+
+@router.patch("/issues/{issue_id}", response_model=IssueResponse)
+def patch_issue(
+        issue_id: int,
+        changes: IssueUpdate,
+        response: Response,
+        if_match: Optional[str] = Header(None),
+        repo: IssueRepository = Depends(get_repository)):
+    """
+    Structured partial update: only the fields present in the body change.
+
+    The cheap path for UI actions and integrations; unlike PUT /issue/ it
+    does not go through the agent. Send the ETag from GET /issue/{id} (or a
+    previous PATCH) in If-Match to update only if nobody changed the issue
+    in between; otherwise 412.
+    """
+    update_data = changes.model_dump(exclude_unset=True, mode="json")
+    if not update_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+    expected = if_match_versions(if_match, issue_id) if if_match else None
+    try:
+        with span("db"):
+            updated = repo.update(issue_id, update_data, expected)
+    except VersionConflict:
+        raise _precondition_failed()
+    if not updated:
         raise HTTPException(status_code=404, detail="Issue not found")
+    response_cache.invalidate()
+    event_bus.publish("updated", updated.issue_id, updated)
+    response.headers["ETag"] = issue_etag(updated)
+    return updated
 
-    db.delete(db_issue)
-    db.commit()
+# Delete issue
+@router.delete("/issues/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_issue(issue_id: int, repo: IssueRepository = Depends(get_repository)):
+    if not repo.delete(issue_id):
+        raise HTTPException(status_code=404, detail="Issue not found")
+    response_cache.invalidate()
+    event_bus.publish("deleted", issue_id)
     return None
 
 @router.get("/issue/{issue_id}",status_code=status.HTTP_200_OK,response_model=IssueResponse)
-def get_issue(issue_uuid: str, db: Session = Depends(get_db)):
-    db_issue = db.query(Issue).filter(Issue.uuid == issue_uuid).first()
-    if not db_issue:
+def get_issue(issue_id: int, request: Request, repo: IssueRepository = Depends(get_repository)):
+    """One issue, with a strong ETag for If-None-Match and for If-Match on PATCH"""
+    issue = repo.get(issue_id)
+    if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
+    return issue_response(request, issue, IssueResponse)
 
-    return db_issue
+@router.get("/agent/stats")
+def agent_stats():
+    """How many update commands were served by the fast path vs. the LLM"""
+    return {**agent.stats(), "response_cache": response_cache.stats()}
 
 @router.get("/")
 def health_check():
@@ -0,0 +1,216 @@
+"""
+Async versions of the issue CRUD routes, backed by AsyncSession.
+
+Mounted ahead of app.api.routes.issues when DB_ASYNC=true, so these handlers
+take over the overlapping paths while everything else stays on the sync router.
+"""
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agent.core import AgentBusyError
+from app.api.async_database import get_async_db
+from app.api.cache import response_cache, issue_etag, if_match_versions, issue_response
+from app.api.events import event_bus
+from app.metrics import span
+from app.api.models import Issue
+from app.api.queries import IssueSort, SortOrder, InvalidCursor, issue_filters, apply_filters, apply_keyset, finish_page
+from app.api.routes.issues import agent, _agent_busy, _cache_bypass, _precondition_failed
+from app.api.schemas import IssueCreate, IssueUpdate, IssueResponse, IssueFilters
+
+router = APIRouter(prefix="/api/issues", tags=["Issues"])
+
+
+@router.post("/issues", status_code=status.HTTP_201_CREATED, response_model=IssueResponse)
+async def create_issue_async(
+        query: str,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        x_cache_bypass: Optional[str] = Header(None),
+        cache_control: Optional[str] = Header(None)):
+    """Create an issue using natural language query."""
+    try:
+        agent_response = await agent.aprocess_create(
+            query, use_cache=not _cache_bypass(x_cache_bypass, cache_control)
+        )
+        if agent_response.get("cache"):
+            response.headers["X-Cache"] = agent_response["cache"].upper()
+
+        if not agent_response.get("tool_result"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not extract issue details from query. Please be more specific."
+            )
+        with span("decode"):
+            issue_data = json.loads(agent_response["tool_result"])
+        with span("validate"):
+            issue = IssueCreate(**issue_data)
+
+        db_issue = Issue(**issue.model_dump())
+        db.add(db_issue)
+        with span("db"):
+            await db.commit()
+        response_cache.invalidate()
+        created = IssueResponse.model_validate(db_issue)
+        event_bus.publish("created", created.issue_id, created)
+        return created
+
+    except HTTPException:
+        raise
+    except AgentBusyError as e:
+        raise _agent_busy(e)
+    except json.JSONDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid issue data format from agent"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Validation error: {str(e)}"
+        )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating issue: {str(e)}"
+        )
+
+
+@router.get("/issues", response_model=List[IssueResponse])
+async def get_issues_async(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        sort: IssueSort = IssueSort.id,
+        order: SortOrder = SortOrder.asc,
+        filters: IssueFilters = Depends(issue_filters),
+        db: AsyncSession = Depends(get_async_db)):
+    """List issues with server-side filtering and keyset pagination."""
+    # Read before the query: replaying events already reflected in the page is harmless
+    event_offset = event_bus.token()
+    cached, token = response_cache.lookup(request)
+    if cached:
+        cached.headers["X-Event-Offset"] = event_offset
+        return cached
+
+    stmt = apply_filters(select(Issue), filters)
+    try:
+        stmt = apply_keyset(stmt, sort, order, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if skip and not cursor:
+        stmt = stmt.offset(skip)
+
+    issues = (await db.scalars(stmt.limit(limit + 1))).all()
+    issues = finish_page(issues, limit, sort, order, request, response)
+    rendered = response_cache.render(token, List[IssueResponse], issues, response)
+    rendered.headers["X-Event-Offset"] = event_offset
+    return rendered
+
+
+@router.put("/issue/", response_model=IssueResponse)
+async def update_issue_async(query: str, db: AsyncSession = Depends(get_async_db)):
+    """Update an issue using natural language."""
+    try:
+        agent_response = await agent.aprocess_update(query)
+        if not agent_response.get("tool_result"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Agent did not return update data."
+            )
+
+        with span("decode"):
+            issue_data = json.loads(agent_response["tool_result"])
+        with span("validate"):
+            update_data = IssueUpdate(**issue_data["updates"]).model_dump(exclude_unset=True, mode="json")
+        with span("db"):
+            db_issue = await db.get(Issue, issue_data["issue_id"])
+            if not db_issue:
+                raise HTTPException(status_code=404, detail="Issue not found")
+            for field, value in update_data.items():
+                setattr(db_issue, field, value)
+            db_issue.updated_at = datetime.utcnow()
+            await db.commit()
+        response_cache.invalidate()
+        updated = IssueResponse.model_validate(db_issue)
+        event_bus.publish("updated", updated.issue_id, updated)
+        return updated
+    except AgentBusyError as e:
+        raise _agent_busy(e)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Validation error: {str(e)}"
+        )
+    except json.JSONDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid issue data format from agent"
+        )
+
+
+@router.patch("/issues/{issue_id}", response_model=IssueResponse)
+async def patch_issue_async(
+        issue_id: int,
+        changes: IssueUpdate,
+        response: Response,
+        if_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db)):
+    """Structured partial update without the agent, with If-Match support."""
+    update_data = changes.model_dump(exclude_unset=True, mode="json")
+    if not update_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+    stmt = update(Issue).where(Issue.issue_id == issue_id)
+    expected = if_match_versions(if_match, issue_id) if if_match else None
+    if expected is not None:
+        stmt = stmt.where(Issue.updated_at.in_(expected))
+    try:
+        with span("db"):
+            db_issue = (await db.scalars(
+                stmt.values(**update_data, updated_at=datetime.utcnow()).returning(Issue)
+            )).one_or_none()
+            updated = IssueResponse.model_validate(db_issue) if db_issue else None
+            await db.commit()
+            if updated is None:
+                if expected is not None and await db.get(Issue, issue_id) is not None:
+                    raise _precondition_failed()
+                raise HTTPException(status_code=404, detail="Issue not found")
+    except Exception:
+        await db.rollback()
+        raise
+    response_cache.invalidate()
+    event_bus.publish("updated", updated.issue_id, updated)
+    response.headers["ETag"] = issue_etag(updated)
+    return updated
+
+
+@router.delete("/issues/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_issue_async(issue_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Single DELETE instead of load-then-delete
+    try:
+        result = await db.execute(delete(Issue).where(Issue.issue_id == issue_id))
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    response_cache.invalidate()
+    event_bus.publish("deleted", issue_id)
+    return None
+
+
+@router.get("/issue/{issue_id}", status_code=status.HTTP_200_OK, response_model=IssueResponse)
+async def get_issue_async(issue_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    db_issue = await db.get(Issue, issue_id)
+    if not db_issue:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    return issue_response(request, db_issue, IssueResponse)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel,Field
-from typing import Optional, List
+from pydantic import BaseModel,Field,field_validator
+from typing import Optional, List, Dict
 
 
 class IssuePriority(str, Enum):
@@ -16,6 +16,12 @@ class IssueStatus(str, Enum):
 
 
 
+class TagMode(str, Enum):
+    any = "any"
+    all = "all"
+
+
+
 class IssueBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
@@ -29,6 +35,12 @@ class IssueCreate(IssueBase):
     pass
 
 
+class IssueImport(IssueCreate):
+    """IssueCreate plus the timestamps legacy records may carry"""
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class IssueUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
@@ -38,6 +50,14 @@ class IssueUpdate(BaseModel):
     root_cause_hint: Optional[str] = None
     estimated_minutes: Optional[int] = Field(None, ge=0)
 
+    @field_validator("title", "priority", "status", "tags")
+    @classmethod
+    def not_null(cls, value):
+        # Omit a field to leave it alone; these columns cannot be cleared
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
 
 class IssueResponse(IssueBase):
     issue_id: int
@@ -47,6 +67,86 @@ class IssueResponse(IssueBase):
     class Config:
         from_attributes = True  # F
 
+
+class IssueFilters(BaseModel):
+    status: Optional[List[IssueStatus]] = None
+    priority: Optional[List[IssuePriority]] = None
+    tags: Optional[List[str]] = None
+    tag_mode: TagMode = TagMode.any
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class IssueStats(BaseModel):
+    total: int
+    estimated_minutes_total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_tag: Dict[str, int]
+    estimated_minutes_by_status: Dict[str, int]
+    estimated_minutes_by_priority: Dict[str, int]
+    # Age of issues that are not closed, bucketed by created_at
+    open_age: Dict[str, int]
+
+
+class SearchHit(BaseModel):
+    issue: IssueResponse
+    rank: float
+    snippet: str
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+    next_offset: Optional[int] = None
+
+
+class IssueBulkUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+    changes: IssueUpdate
+
+
+class BulkUpdateResponse(BaseModel):
+    updated: int
+    missing: List[int]
+    issues: List[IssueResponse]
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    query: Optional[str] = None
+    ok: bool
+    issue: Optional[IssueResponse] = None
+    error: Optional[str] = None
+
+
+class BatchCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BatchItemResult]
+
+
+class ImportReject(BaseModel):
+    record: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
+    # First rejects only; `rejected` has the full count
+    rejects: List[ImportReject] = Field(default_factory=list)
+
 # class IssueCreate(BaseModel):
 #     title : str = Field(min_length=1,max_length=100)
 #     description: str = Field(min_length=5, max_length=2000)
@@ -0,0 +1,92 @@
+"""
+Aggregate issue statistics.
+
+Counts and estimate sums come from the trigger-maintained `issue_counters`
+table on SQLite, and from GROUP BY queries on backends without the triggers.
+Open-age buckets are always computed with a range scan over the
+(status, created_at) index.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, case
+
+from app.api.models import Issue, IssueTag, IssueCounter
+from app.api.schemas import IssueStats, IssueStatus
+
+# Statuses counted as still open for the age buckets
+OPEN_STATUSES = [IssueStatus.open.value, IssueStatus.in_progress.value]
+
+# (bucket name, minimum age); checked in order, the last bucket catches the rest
+OPEN_AGE_BUCKETS = [
+    ("lt_1d", timedelta(days=0)),
+    ("1d_7d", timedelta(days=1)),
+    ("7d_30d", timedelta(days=7)),
+    ("gt_30d", timedelta(days=30)),
+]
+
+
+def _counter_rows(db, tag_limit):
+    rows = db.execute(
+        select(IssueCounter.dimension, IssueCounter.value, IssueCounter.issues, IssueCounter.estimated_minutes)
+        .where(IssueCounter.dimension.in_(["status", "priority"]), IssueCounter.issues > 0)
+    ).all()
+    rows += db.execute(
+        select(IssueCounter.dimension, IssueCounter.value, IssueCounter.issues, IssueCounter.estimated_minutes)
+        .where(IssueCounter.dimension == "tag", IssueCounter.issues > 0)
+        .order_by(IssueCounter.issues.desc())
+        .limit(tag_limit)
+    ).all()
+    return rows
+
+
+def _group_by_rows(db, tag_limit):
+    rows = []
+    for dimension, column in (("status", Issue.status), ("priority", Issue.priority)):
+        for value, count, minutes in db.execute(
+                select(column, func.count(), func.coalesce(func.sum(Issue.estimated_minutes), 0))
+                .group_by(column)):
+            rows.append((dimension, value, count, minutes))
+    count = func.count().label("count")
+    for tag, tag_count in db.execute(
+            select(IssueTag.tag, count).group_by(IssueTag.tag).order_by(count.desc()).limit(tag_limit)):
+        rows.append(("tag", tag, tag_count, 0))
+    return rows
+
+
+def open_age_buckets(db, now=None):
+    now = now or datetime.utcnow()
+    # Newest bucket first so the first matching WHEN wins
+    whens = [
+        (Issue.created_at >= now - OPEN_AGE_BUCKETS[i + 1][1], name)
+        for i, (name, _) in enumerate(OPEN_AGE_BUCKETS[:-1])
+    ]
+    bucket = case(*whens, else_=OPEN_AGE_BUCKETS[-1][0]).label("bucket")
+    counts = dict(db.execute(
+        select(bucket, func.count()).where(Issue.status.in_(OPEN_STATUSES)).group_by(bucket)
+    ).all())
+    return {name: counts.get(name, 0) for name, _ in OPEN_AGE_BUCKETS}
+
+
+def compute_stats(db, tag_limit=50):
+    if db.get_bind().dialect.name == "sqlite":
+        rows = _counter_rows(db, tag_limit)
+    else:
+        rows = _group_by_rows(db, tag_limit)
+
+    grouped = {"status": {}, "priority": {}, "tag": {}}
+    minutes = {"status": {}, "priority": {}}
+    for dimension, value, count, estimated in rows:
+        grouped[dimension][value] = count
+        if dimension in minutes:
+            minutes[dimension][value] = estimated
+
+    return IssueStats(
+        total=sum(grouped["status"].values()),
+        estimated_minutes_total=sum(minutes["status"].values()),
+        by_status=grouped["status"],
+        by_priority=grouped["priority"],
+        by_tag=grouped["tag"],
+        estimated_minutes_by_status=minutes["status"],
+        estimated_minutes_by_priority=minutes["priority"],
+        open_age=open_age_buckets(db),
+    )
@@ -1,18 +1,200 @@
-from pathlib import Path
+"""
+File-backed issue storage for deployments without a database.
+
+Records live in an append-only NDJSON log (`issues.log`) plus a snapshot
+(`issues.snapshot`). Every write appends one line and fsyncs it, so a write
+costs O(1) regardless of how many issues exist, and a crash can lose at most
+a torn final line, which is dropped on the next load. Once the log holds
+`compact_every` entries the current records are written to a new snapshot
+(temp file, fsync, atomic rename) and the log is truncated. Startup reads
+the snapshot and replays only the log written since.
+
+Log lines are {"seq": n, "op": "put", "record": {...}} or
+{"seq": n, "op": "del", "key": k}. The snapshot starts with a
+{"seq": n, "count": m} header line, followed by one record per line; log
+entries with seq <= n are already in the snapshot and are skipped, which
+covers a crash between the snapshot rename and the log truncation.
+
+A legacy `issues.json` (one JSON array) is imported on first load. Records
+without created_at/updated_at get the import time, so the timestamps are
+part of the first snapshot and stay the same on later loads.
+"""
 import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from app import config
 
-DATA_DIR = Path("data")
+DATA_DIR = Path(config.STORAGE_DIR)
+# Legacy whole-file store, read once when no log/snapshot exists yet
 DATA_FILE = DATA_DIR / "issues.json"
 
-def load_data():
-    if DATA_FILE.exists():
-        with open(DATA_FILE,"r") as f:
+
+def _fsync_dir(path: Path):
+    # Make a rename/create durable; not supported on every platform
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class LogStore:
+    def __init__(self, directory=DATA_DIR, key: str = "issue_id",
+                 compact_every: int = config.STORAGE_COMPACT_EVERY, fsync: bool = config.STORAGE_FSYNC):
+        self.directory = Path(directory)
+        self.key = key
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.log_path = self.directory / "issues.log"
+        self.snapshot_path = self.directory / "issues.snapshot"
+        self.legacy_path = self.directory / "issues.json"
+        self.seq = 0
+        self.log_entries = 0
+        self._log = None
+        self._lock = threading.RLock()
+
+    # Loading
+
+    def load(self) -> dict:
+        """Return all records keyed by `key`: snapshot plus the log written since"""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            records = {}
+            snapshot_seq = 0
+            legacy = False
+            if self.snapshot_path.exists():
+                snapshot_seq = self._read_snapshot(records)
+            elif not self.log_path.exists() and self.legacy_path.exists():
+                self._read_legacy(records)
+                legacy = True
+            self.seq = snapshot_seq
+            self.log_entries = self._replay_log(records, snapshot_seq)
+            self._open_log()
+            if legacy:
+                self.compact(records.values())
+            return records
+
+    def _read_snapshot(self, records) -> int:
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            for line in f:
+                record = json.loads(line)
+                records[record[self.key]] = record
+        return header["seq"]
+
+    def _read_legacy(self, records):
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
             content = f.read()
-            if content.strip():
-                return json.loads(content)
-    return []
+        imported_at = datetime.utcnow().isoformat()
+        for record in (json.loads(content) if content.strip() else []):
+            record = {self.key: len(records) + 1, **record}
+            record.setdefault("created_at", imported_at)
+            record.setdefault("updated_at", record["created_at"])
+            records[record[self.key]] = record
+
+    def _replay_log(self, records, snapshot_seq) -> int:
+        if not self.log_path.exists():
+            return 0
+        entries = 0
+        good_offset = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash: only ever the last line
+                    break
+                good_offset += len(line)
+                entries += 1
+                if entry["seq"] <= snapshot_seq:
+                    continue
+                self.seq = entry["seq"]
+                if entry["op"] == "put":
+                    records[entry["record"][self.key]] = entry["record"]
+                else:
+                    records.pop(entry["key"], None)
+        if good_offset < self.log_path.stat().st_size:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(good_offset)
+        return entries
+
+    # Writing
+
+    def _open_log(self):
+        if self._log:
+            self._log.close()
+        self._log = open(self.log_path, "ab")
+
+    def _append(self, entry: dict):
+        with self._lock:
+            self.seq += 1
+            entry = {"seq": self.seq, **entry}
+            self._log.write((json.dumps(entry, separators=(",", ":")) + "\n").encode())
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self.log_entries += 1
+
+    def put(self, record: dict):
+        self._append({"op": "put", "record": record})
+
+    def delete(self, key):
+        self._append({"op": "del", "key": key})
+
+    def needs_compaction(self) -> bool:
+        return self.compact_every > 0 and self.log_entries >= self.compact_every
+
+    def compact(self, records):
+        """Write `records` (an iterable of dicts) as the new snapshot and truncate the log"""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                records = list(records)
+                f.write(json.dumps({"seq": self.seq, "count": len(records)}) + "\n")
+                for record in records:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            _fsync_dir(self.directory)
+
+            if self._log:
+                self._log.close()
+            with open(self.log_path, "wb") as f:
+                os.fsync(f.fileno())
+            self.log_entries = 0
+            self._open_log()
+
+    def close(self):
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+
+def load_data():
+    """Return every stored issue record"""
+    store = LogStore()
+    try:
+        return list(store.load().values())
+    finally:
+        store.close()
+
 
 def save_data(data):
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=2)
\ No newline at end of file
+    """Replace the stored issues with `data` in one snapshot"""
+    store = LogStore()
+    try:
+        store.load()
+        store.compact({store.key: index, **record} for index, record in enumerate(data, start=1))
+    finally:
+        store.close()
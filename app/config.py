@@ -0,0 +1,115 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    return value.lower() in ("1", "true", "yes") if value not in (None, "") else default
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_choice(name, default, choices):
+    """Lowercased setting that must be one of `choices`, checked when the app loads"""
+    value = (os.getenv(name) or default).lower()
+    if value not in choices:
+        raise ValueError(f"Unknown {name} {value!r}, expected one of {sorted(choices)}")
+    return value
+
+
+# Agent / LLM
+AGENT_MODEL = os.getenv("AGENT_MODEL", "llama3.1:8b")
+# Max number of concurrent model calls sent to Ollama
+AGENT_MAX_CONCURRENCY = _env_int("AGENT_MAX_CONCURRENCY", 4)
+# Seconds a request may wait for a free model slot before giving up (0 = wait forever)
+AGENT_QUEUE_TIMEOUT = _env_float("AGENT_QUEUE_TIMEOUT", 30.0)
+
+# Semantic cache for NL issue creation
+# Off by default: it needs SEMANTIC_CACHE_EMBED_MODEL pulled in Ollama next to AGENT_MODEL
+SEMANTIC_CACHE_ENABLED = _env_bool("SEMANTIC_CACHE_ENABLED", False)
+SEMANTIC_CACHE_EMBED_MODEL = os.getenv("SEMANTIC_CACHE_EMBED_MODEL", "nomic-embed-text")
+# Minimum cosine similarity for a near-duplicate query to count as a hit
+SEMANTIC_CACHE_THRESHOLD = _env_float("SEMANTIC_CACHE_THRESHOLD", 0.92)
+SEMANTIC_CACHE_TTL = _env_float("SEMANTIC_CACHE_TTL", 3600.0)
+SEMANTIC_CACHE_MAX_ENTRIES = _env_int("SEMANTIC_CACHE_MAX_ENTRIES", 1024)
+
+# Batch NL creation
+BATCH_MAX_ITEMS = _env_int("BATCH_MAX_ITEMS", 500)
+# Max number of batch items extracted at once (model calls are still bounded by AGENT_MAX_CONCURRENCY)
+BATCH_MAX_PARALLEL = _env_int("BATCH_MAX_PARALLEL", 8)
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./issues.db")
+# Engine profile: "performance" (WAL, synchronous=NORMAL, ...) or "default" (SQLite's own settings)
+DB_PROFILE = os.getenv("DB_PROFILE", "performance")
+# Per-pragma overrides on top of the profile, e.g. SQLITE_SYNCHRONOUS=FULL
+SQLITE_PRAGMA_OVERRIDES = {
+    pragma: os.environ[f"SQLITE_{pragma.upper()}"]
+    for pragma in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store")
+    if os.getenv(f"SQLITE_{pragma.upper()}")
+}
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT = _env_float("DB_POOL_TIMEOUT", 30.0)
+# Serve the CRUD routes from an AsyncEngine/AsyncSession stack instead of the sync one
+DB_ASYNC = _env_bool("DB_ASYNC", False)
+# Defaults to DATABASE_URL with an async driver (sqlite+aiosqlite, postgresql+asyncpg)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Response cache for the read routes (ETags are always sent; this controls body caching)
+RESPONSE_CACHE_ENABLED = _env_bool("RESPONSE_CACHE_ENABLED", True)
+RESPONSE_CACHE_TTL = _env_float("RESPONSE_CACHE_TTL", 60.0)
+RESPONSE_CACHE_MAX_ENTRIES = _env_int("RESPONSE_CACHE_MAX_ENTRIES", 512)
+# "package.module:factory" for a shared backend; empty = in-process LRU
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "")
+
+# Rows fetched per server-side cursor round trip in GET /export
+EXPORT_BATCH_SIZE = _env_int("EXPORT_BATCH_SIZE", 1000)
+
+# File-backed issue store (app.api.storage)
+STORAGE_DIR = os.getenv("STORAGE_DIR", "data")
+# Log entries written before the log is folded into a new snapshot
+STORAGE_COMPACT_EVERY = _env_int("STORAGE_COMPACT_EVERY", 10_000)
+# fsync every append; turning this off trades durability for write throughput
+STORAGE_FSYNC = _env_bool("STORAGE_FSYNC", True)
+
+# Issue store behind the CRUD routes: sqlalchemy, file (app.api.storage) or memory
+ISSUE_BACKEND = _env_choice("ISSUE_BACKEND", "sqlalchemy", {"sqlalchemy", "file", "memory"})
+
+# Per-request stage timings in a Server-Timing response header
+SERVER_TIMING_ENABLED = _env_bool("SERVER_TIMING_ENABLED", True)
+# Also print one JSON line per request with the same breakdown
+REQUEST_TIMING_LOG = _env_bool("REQUEST_TIMING_LOG", False)
+
+# Admin endpoints (/admin/...) need this token in X-Admin-Token; disabled when unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Request profiler (app.api.profiling). Profile a request by sending
+# "X-Profile: sample|cprofile" with a valid X-Admin-Token, or at random at
+# PROFILER_SAMPLE_RATE (0..1) using PROFILER_MODE
+PROFILER_SAMPLE_RATE = _env_float("PROFILER_SAMPLE_RATE", 0.0)
+PROFILER_MODE = _env_choice("PROFILER_MODE", "sample", {"sample", "cprofile"})
+# Seconds between stack samples in "sample" mode
+PROFILER_INTERVAL = _env_float("PROFILER_INTERVAL", 0.005)
+PROFILER_DIR = os.getenv("PROFILER_DIR", "profiles")
+PROFILER_MAX_PROFILES = _env_int("PROFILER_MAX_PROFILES", 50)
+PROFILER_MAX_BYTES = _env_int("PROFILER_MAX_BYTES", 100 * 1024 * 1024)
+
+# Live change feed (app.api.events): events kept for reconnecting clients,
+# and seconds between keep-alives on idle SSE/WebSocket streams
+EVENTS_BUFFER_SIZE = _env_int("EVENTS_BUFFER_SIZE", 10000)
+EVENTS_HEARTBEAT = _env_float("EVENTS_HEARTBEAT", 15.0)
+
+# Most issue ids accepted by one bulk PATCH /issues
+BULK_UPDATE_MAX_IDS = _env_int("BULK_UPDATE_MAX_IDS", 5000)
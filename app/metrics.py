@@ -0,0 +1,278 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+A deliberately small subset of the Prometheus client model: counters, gauges
+and cumulative histograms with labels, held in one registry and rendered by
+`render()` for GET /metrics. Values are per process; with several workers,
+scrape each one (or aggregate in Prometheus).
+
+Request-scoped numbers (DB queries and time, named stage spans) are
+collected in a `RequestStats` held in a ContextVar, which the timing
+middleware sets for each request and SQLAlchemy cursor events and `span()`
+add to. The middleware turns them into a Server-Timing header.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Dialect, Engine
+
+# Latency buckets in seconds, from sub-millisecond DB calls to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        yield from super().render()
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> ([count per bucket], sum, count)
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self):
+        yield from super().render()
+        with self._lock:
+            values = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# HTTP
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method",)))
+
+# Database
+DB_QUERIES = REGISTRY.register(Counter(
+    "db_queries_total", "SQL statements executed, by route", ("route",)))
+DB_QUERY_LATENCY = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "Time spent executing single SQL statements", ("route",)))
+DB_QUERIES_PER_REQUEST = REGISTRY.register(Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)))
+DB_TIME_PER_REQUEST = REGISTRY.register(Histogram(
+    "http_request_db_seconds", "Total SQL time per HTTP request", ("route",)))
+
+# LLM
+LLM_CALLS = REGISTRY.register(Counter(
+    "llm_calls_total", "Agent model calls by outcome", ("model", "outcome")))
+LLM_LATENCY = REGISTRY.register(Histogram(
+    "llm_call_duration_seconds", "Agent model call latency (all tool-calling rounds)", ("model",)))
+LLM_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "llm_queue_wait_seconds", "Time spent waiting for a free model slot", ("model",)))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total", "Tokens reported by the model, by direction", ("model", "direction")))
+LLM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "llm_calls_in_flight", "Agent model calls currently running", ("model",)))
+
+
+class RequestStats:
+    # The route is only known once the request has been routed, so statement
+    # timings are kept here and labelled when the request finishes
+    __slots__ = ("db_queries", "db_seconds", "query_durations", "spans")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.query_durations = []
+        # span name -> [total seconds, count], in first-seen order
+        self.spans = {}
+
+    def add_span(self, name: str, seconds: float):
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value; durations in milliseconds"""
+        parts = [f"{name};dur={seconds * 1000:.2f}" + (f';desc="x{count}"' if count > 1 else "")
+                 for name, (seconds, count) in self.spans.items()]
+        if self.db_queries:
+            parts.append(f'sql;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"')
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+    def finish(self, route: str):
+        DB_QUERIES_PER_REQUEST.observe(self.db_queries, route=route)
+        DB_TIME_PER_REQUEST.observe(self.db_seconds, route=route)
+        if self.db_queries:
+            DB_QUERIES.inc(self.db_queries, route=route)
+        for elapsed in self.query_durations:
+            DB_QUERY_LATENCY.observe(elapsed, route=route)
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Time a stage of the current request for Server-Timing; a no-op outside requests"""
+    stats = current_request.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_span(name, time.perf_counter() - start)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = current_request.get()
+    if stats is None:
+        # Startup, migrations, streamed response bodies
+        DB_QUERIES.inc(route="background")
+        DB_QUERY_LATENCY.observe(elapsed, route="background")
+        return
+    stats.db_queries += 1
+    stats.db_seconds += elapsed
+    stats.query_durations.append(elapsed)
+
+
+@event.listens_for(Dialect, "handle_error")
+def _handle_error(context):
+    # A statement that raised never reaches after_cursor_execute; drop its start time
+    # so it does not pair with the next query on this pooled connection
+    if context.connection is not None and context.execution_context is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def record_llm_usage(model: str, messages):
+    """Add token counts from the usage_metadata of new AI messages"""
+    for message in messages:
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            LLM_TOKENS.inc(usage.get("input_tokens", 0), model=model, direction="input")
+            LLM_TOKENS.inc(usage.get("output_tokens", 0), model=model, direction="output")
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,392 @@
+"""
+HTTP load benchmark for the API in main.py, in-process (ASGI) and over uvicorn.
+
+    python -m benchmarks.bench_api --rows 10000 100000 --json results/api-$(git rev-parse --short HEAD).json
+    python -m benchmarks.bench_api --compare results/api-old.json results/api-new.json
+
+For every --rows value a SQLite database is seeded once through the
+migrations and copied for each transport, so runs start from identical
+data. Each run gets a fresh process (the app reads DATABASE_URL and builds
+its engine at import):
+
+- asgi: the app is called through httpx.ASGITransport in the benchmark
+  process; measures the framework and database without sockets.
+- uvicorn: the app is served by a uvicorn subprocess on 127.0.0.1 and
+  driven over HTTP/1.1 keep-alive connections.
+
+The agent is replaced by StubAgent, which sleeps --llm-latency seconds and
+returns a fixed create/update payload, so create/update timings cover the
+API and the database rather than the model.
+
+For every scenario the output has requests/s, p50/p95/p99 latency (ms),
+error count and the serving process's RSS/peak RSS. It also records the
+git commit and settings, so runs from different commits can be compared
+with --compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+SCENARIOS = ("list", "list_filtered", "get", "create", "update", "delete")
+TRANSPORTS = ("asgi", "uvicorn")
+
+
+class StubAgent:
+    """Stands in for AgentService with a fixed, configurable model latency"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def _model(self):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def aprocess_create(self, user_input, use_cache=True):
+        await self._model()
+        payload = {
+            "title": user_input[:60],
+            "description": user_input,
+            "priority": "medium",
+            "status": "open",
+            "tags": ["bug", "backend"],
+            "root_cause_hint": "benchmark",
+            "estimated_minutes": 30,
+        }
+        return {"content": "", "tool_result": json.dumps(payload), "tools_used": ["create_issue_tool"]}
+
+    async def aprocess_update(self, user_input):
+        await self._model()
+        issue_id = int(re.search(r"\d+", user_input).group())
+        payload = {"issue_id": issue_id, "updates": {"status": "closed", "priority": "high"}}
+        return {"content": "", "tool_result": json.dumps(payload), "tools_used": ["update_issue_tool"]}
+
+    def stats(self):
+        return {"paths": {"stub": self.calls}, "total": self.calls}
+
+
+def install_stub_agent(latency: float):
+    """Swap the agent used by the issue routes (sync and async)"""
+    from app.api.routes import issues
+    stub = StubAgent(latency)
+    issues.agent = stub
+    async_routes = sys.modules.get("app.api.routes.issues_async")
+    if async_routes is not None:
+        async_routes.agent = stub
+    return stub
+
+
+def scenario_request(name: str, i: int, rows: int, rng: random.Random):
+    """(method, path) for request number `i` of a scenario"""
+    if name == "list":
+        return "GET", "/api/issues/issues?limit=50"
+    if name == "list_filtered":
+        return "GET", "/api/issues/issues?status=open&tag=bug&sort=created&order=desc&limit=50"
+    if name == "get":
+        return "GET", f"/api/issues/issue/{rng.randint(1, rows // 2)}"
+    if name == "create":
+        return "POST", f"/api/issues/issues?query=Checkout+page+times+out+{i}"
+    if name == "update":
+        return "PUT", f"/api/issues/issue/?query=update+issue+{rng.randint(1, rows // 2)}+to+closed"
+    if name == "delete":
+        # Counts down from the highest seeded id so every delete hits a row
+        return "DELETE", f"/api/issues/issues/{rows - i}"
+    raise ValueError(name)
+
+
+def summarize(latencies, errors: int, elapsed: float) -> dict:
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+async def run_scenario(client, name: str, rows: int, requests: int, concurrency: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    plan = [scenario_request(name, i, rows, rng) for i in range(requests)]
+    pending = iter(plan)
+    latencies = []
+    errors = 0
+
+    async def user():
+        nonlocal errors
+        for method, path in pending:
+            start = time.perf_counter()
+            response = await client.request(method, path)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def process_memory(pid="self") -> dict:
+    """Current and peak RSS in MB from /proc (Linux), else peak from getrusage"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f)
+        return {
+            "rss_mb": int(fields["VmRSS"].split()[0]) / 1024,
+            "peak_rss_mb": int(fields["VmHWM"].split()[0]) / 1024,
+        }
+    except (OSError, KeyError):
+        if pid != "self":
+            return {}
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"peak_rss_mb": peak_kb / 1024}
+
+
+async def drive(client, rows: int, args, memory) -> dict:
+    results = {}
+    for name in args.scenarios:
+        # Warm up connections, caches and SQLite pages before timing
+        await run_scenario(client, "list" if name in ("create", "update", "delete") else name,
+                           rows, args.warmup, args.concurrency, seed=7)
+        results[name] = await run_scenario(client, name, rows, args.requests, args.concurrency)
+        results[name].update(memory())
+        print(f"  {name:<14} {results[name]['rps']:>9,.0f} req/s  p95 {results[name]['p95_ms']:.2f} ms", file=sys.stderr)
+    return results
+
+
+def seed_database(path: str, rows: int):
+    from sqlalchemy import create_engine
+
+    from app.api.migrations import run_migrations
+    from app.api.models import Base
+    from benchmarks.seed import seed_issues
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    seed_issues(engine, rows)
+    engine.dispose()
+
+
+def app_env(db_path: str, extra) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "SEMANTIC_CACHE_ENABLED": "false",
+        "PROFILER_SAMPLE_RATE": "0",
+    }
+    for item in extra:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def serve(args):
+    """--serve: run the app under uvicorn with the stub agent installed"""
+    import uvicorn
+
+    import main
+    install_stub_agent(args.llm_latency)
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+def run_in_process(args):
+    """--in-process: drive the app through ASGITransport and write the results to --out"""
+    import httpx
+
+    import main
+    from app.api.Database import init_db
+    install_stub_agent(args.llm_latency)
+    init_db()
+
+    async def go():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await drive(client, args.rows[0], args, process_memory)
+
+    with open(args.out, "w") as f:
+        json.dump(asyncio.run(go()), f)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, proc, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def run_asgi(db_path: str, rows: int, args) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        out = f.name
+    try:
+        cmd = [sys.executable, "-m", "benchmarks.bench_api", "--in-process", "--out", out,
+               "--rows", str(rows), *_shared_flags(args)]
+        # App output (e.g. per-request prints) is not part of the report
+        subprocess.run(cmd, env=app_env(db_path, args.env), check=True, stdout=subprocess.DEVNULL)
+        with open(out) as f:
+            return json.load(f)
+    finally:
+        os.remove(out)
+
+
+def run_uvicorn(db_path: str, rows: int, args) -> dict:
+    import httpx
+
+    port = _free_port()
+    cmd = [sys.executable, "-m", "benchmarks.bench_api", "--serve", "--port", str(port), *_shared_flags(args)]
+    proc = subprocess.Popen(cmd, env=app_env(db_path, args.env), stdout=subprocess.DEVNULL)
+    try:
+        _wait_for_port(port, proc)
+
+        async def go():
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+                return await drive(client, rows, args, lambda: process_memory(proc.pid))
+
+        return asyncio.run(go())
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def _shared_flags(args):
+    flags = ["--llm-latency", str(args.llm_latency), "--requests", str(args.requests),
+             "--warmup", str(args.warmup), "--concurrency", str(args.concurrency),
+             "--scenarios", *args.scenarios]
+    for item in args.env:
+        flags += ["--env", item]
+    return flags
+
+
+def git_commit():
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old.get('commit')} -> {new.get('commit')}\n")
+    print(f"{'rows':>8} {'transport':<9} {'scenario':<14}{'req/s':>22}{'p95 ms':>24}")
+    for key, runs in new["results"].items():
+        for name, r in runs.items():
+            base = old["results"].get(key, {}).get(name)
+            if not base:
+                continue
+            rows, transport = key.split(":")
+            rps_change = (r["rps"] / base["rps"] - 1) * 100 if base["rps"] else 0.0
+            p95_change = (r["p95_ms"] / base["p95_ms"] - 1) * 100 if base["p95_ms"] else 0.0
+            print(f"{rows:>8} {transport:<9} {name:<14}"
+                  f"{base['rps']:>9,.0f} -> {r['rps']:>7,.0f} {rps_change:+5.0f}%"
+                  f"{base['p95_ms']:>9.2f} -> {r['p95_ms']:>7.2f} {p95_change:+5.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000],
+                        help="Seeded database sizes, e.g. 10000 100000 1000000")
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="Timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Stub agent delay in seconds")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra app settings, e.g. --env RESPONSE_CACHE_ENABLED=false")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files and exit")
+    # Internal: child process modes
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+    if args.serve:
+        return serve(args)
+    if args.in_process:
+        return run_in_process(args)
+
+    if any(rows // 2 < args.requests for rows in args.rows) and "delete" in args.scenarios:
+        parser.error("--rows must be at least twice --requests (deletes count down from the top half)")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "requests": args.requests, "warmup": args.warmup, "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency, "env": args.env,
+        },
+        "results": {},
+    }
+    runners = {"asgi": run_asgi, "uvicorn": run_uvicorn}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            template = os.path.join(tmp, f"seed-{rows}.db")
+            start = time.perf_counter()
+            seed_database(template, rows)
+            print(f"seeded {rows:,} issues in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            for transport in args.transports:
+                db_path = os.path.join(tmp, f"run-{rows}-{transport}.db")
+                shutil.copyfile(template, db_path)
+                print(f"{rows:,} rows / {transport}", file=sys.stderr)
+                report["results"][f"{rows}:{transport}"] = runners[transport](db_path, rows, args)
+                os.remove(db_path)
+            os.remove(template)
+
+    print(f"\n{'rows':>8} {'transport':<9} {'scenario':<14}{'req/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>6}{'rss MB':>8}")
+    for key, runs in report["results"].items():
+        rows, transport = key.split(":")
+        for name, r in runs.items():
+            print(f"{rows:>8} {transport:<9} {name:<14}{r['rps']:>10,.0f}{r['p50_ms']:>9.2f}"
+                  f"{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['errors']:>6}{r.get('rss_mb', 0):>8.0f}")
+
+    if args.json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_path)), exist_ok=True)
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
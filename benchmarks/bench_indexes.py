@@ -0,0 +1,101 @@
+"""
+Query time for the issue list/filter queries before and after migration 1's indexes.
+
+    python -m benchmarks.bench_indexes --rows 1000000
+
+Seeds a throwaway SQLite database, times each query without secondary indexes,
+applies the migrations and times them again.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import Session
+
+from app.api.migrations import run_migrations
+from app.api.models import Issue
+from app.api.queries import IssueSort, SortOrder, apply_filters, apply_keyset, encode_cursor
+from app.api.schemas import IssueFilters, IssueStatus, IssuePriority
+from benchmarks.seed import seed_issues
+
+
+def list_query(filters=None, sort=IssueSort.created, order=SortOrder.desc, cursor=None, limit=100):
+    stmt = apply_filters(select(Issue), filters or IssueFilters())
+    return apply_keyset(stmt, sort, order, cursor).limit(limit)
+
+
+def build_queries(session):
+    newest = session.scalar(select(func.max(Issue.created_at)))
+    total = session.scalar(select(func.count()).select_from(Issue))
+    # Cursor 90% of the way through the created_at keyset
+    deep_row = session.scalars(
+        list_query(sort=IssueSort.created, order=SortOrder.asc, limit=1).offset(int(total * 0.9))
+    ).first()
+    deep_cursor = encode_cursor(deep_row, IssueSort.created, SortOrder.asc)
+
+    return {
+        "newest_page": list_query(),
+        "status_open_newest": list_query(IssueFilters(status=[IssueStatus.open])),
+        "open_or_in_progress_high": list_query(IssueFilters(
+            status=[IssueStatus.open, IssueStatus.in_progress], priority=[IssuePriority.high])),
+        "recently_updated": list_query(sort=IssueSort.updated),
+        "deep_keyset_page": list_query(sort=IssueSort.created, order=SortOrder.asc, cursor=deep_cursor),
+        "count_by_status": select(Issue.status, func.count()).group_by(Issue.status),
+        "created_last_7_days": select(func.count()).select_from(
+            apply_filters(select(Issue.issue_id), IssueFilters(created_after=newest - timedelta(days=7))).subquery()),
+    }
+
+
+def time_queries(engine, repeat):
+    timings = {}
+    with Session(engine) as session:
+        for name, stmt in build_queries(session).items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                session.execute(stmt).all()
+                samples.append(time.perf_counter() - start)
+            timings[name] = statistics.median(samples) * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Issue.__table__.create(engine)
+        for index in Issue.__table__.indexes:
+            index.drop(engine)
+
+        start = time.perf_counter()
+        seed_issues(engine, args.rows)
+        print(f"Seeded {args.rows:,} issues in {time.perf_counter() - start:.1f}s")
+
+        before = time_queries(engine, args.repeat)
+        start = time.perf_counter()
+        run_migrations(engine)
+        print(f"Migrations took {time.perf_counter() - start:.1f}s")
+        after = time_queries(engine, args.repeat)
+        engine.dispose()
+
+    print(f"\n{'query':<28}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in before:
+        print(f"{name:<28}{before[name]:>14.2f}{after[name]:>14.2f}{before[name] / after[name]:>9.1f}x")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"rows": args.rows, "before_ms": before, "after_ms": after}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Issue repositories compared on the same workload: SQLAlchemy (SQLite), file
+(append-only log) and in-memory.
+
+    python -m benchmarks.bench_repositories --rows 20000
+
+Each backend starts empty in a temporary directory and runs the same
+sequence: single creates, a bulk create_many, point reads, filtered cursor
+pages, updates and deletes. Results are operations per second.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.Database import install_sqlite_pragmas
+from app.api.migrations import run_migrations
+from app.api.models import Base
+from app.api.queries import IssueSort, SortOrder, encode_cursor
+from app.api.repository import SqlAlchemyIssueRepository, InMemoryIssueRepository, FileIssueRepository
+from app.api.schemas import IssueCreate, IssueFilters, IssueStatus
+from app.api.storage import LogStore
+from benchmarks.seed import synthetic_issues
+
+FIELDS = ("title", "description", "priority", "status", "tags", "root_cause_hint", "estimated_minutes")
+
+
+def make_repositories(tmp):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    install_sqlite_pragmas(engine, "performance")
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    return {
+        "sqlalchemy": SqlAlchemyIssueRepository(session),
+        "file": FileIssueRepository(LogStore(os.path.join(tmp, "file"))),
+        "file_nofsync": FileIssueRepository(LogStore(os.path.join(tmp, "file_nofsync"), fsync=False)),
+        "memory": InMemoryIssueRepository(),
+    }
+
+
+def timed(ops, fn):
+    start = time.perf_counter()
+    fn()
+    return ops / (time.perf_counter() - start)
+
+
+def run_workload(repo, issues, pages, rng):
+    half = len(issues) // 2
+    results = {}
+
+    results["create"] = timed(half, lambda: [repo.create(issue) for issue in issues[:half]])
+    results["create_many"] = timed(len(issues) - half, lambda: repo.create_many(issues[half:]))
+
+    ids = [rng.randint(1, len(issues)) for _ in range(len(issues))]
+    results["get"] = timed(len(ids), lambda: [repo.get(i) for i in ids])
+
+    filters = IssueFilters(status=[IssueStatus.open], tags=["bug"])
+
+    def page_through():
+        cursor = None
+        for _ in range(pages):
+            page = repo.list(filters, IssueSort.created, SortOrder.desc, limit=50, cursor=cursor)
+            if not page:
+                break
+            cursor = encode_cursor(page[-1], IssueSort.created, SortOrder.desc)
+
+    results["list_page"] = timed(pages, page_through)
+
+    changed = ids[:max(1, len(ids) // 10)]
+    results["update"] = timed(len(changed), lambda: [repo.update(i, {"status": "closed"}) for i in changed])
+    results["delete"] = timed(len(changed), lambda: [repo.delete(i) for i in changed])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    issues = [IssueCreate(**{k: row[k] for k in FIELDS}) for row in synthetic_issues(args.rows)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, repo in make_repositories(tmp).items():
+            results[name] = run_workload(repo, issues, args.pages, random.Random(42))
+            print(f"{name}: done")
+
+    operations = list(next(iter(results.values())))
+    print(f"\n{'ops/s':<14}" + "".join(f"{op:>13}" for op in operations))
+    for name, r in results.items():
+        print(f"{name:<14}" + "".join(f"{r[op]:>13,.0f}" for op in operations))
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"rows": args.rows, "pages": args.pages, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Full-text search: FTS5 (bm25-ranked) vs. a LIKE '%term%' scan.
+
+    python -m benchmarks.bench_search --rows 500000
+
+Seeds a throwaway SQLite database through the migrations (so the FTS
+triggers index every insert), plants a few rare terms, then times one page
+of results for each query with both approaches.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, select, or_, insert
+from sqlalchemy.orm import Session
+
+from app.api.migrations import run_migrations
+from app.api.models import Base, Issue
+from app.api.queries import fts_match_query, search_statement
+from benchmarks.seed import seed_issues
+
+RARE_TERMS = ["kubernetes", "webhook", "oauth"]
+QUERIES = ["kubernetes", "oauth webhook", "payment timeout", "gate", "memory leak worker"]
+
+
+def like_statement(q, limit):
+    clauses = []
+    for word in q.split():
+        pattern = f"%{word}%"
+        clauses.append(or_(Issue.title.like(pattern), Issue.description.like(pattern),
+                           Issue.root_cause_hint.like(pattern)))
+    return select(Issue).where(*clauses).limit(limit)
+
+
+def plant_rare_terms(engine, every=10_000):
+    """A handful of rows containing terms the synthetic vocabulary never uses"""
+    with engine.begin() as conn:
+        ids = conn.execute(select(Issue.issue_id).where(Issue.issue_id % every == 0)).scalars().all()
+        rows = [{"title": f"{RARE_TERMS[i % len(RARE_TERMS)]} failure on node {i}",
+                 "description": "oauth webhook kubernetes integration"} for i in ids]
+        if rows:
+            conn.execute(insert(Issue.__table__), rows)
+
+
+def median_ms(session, stmt, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        session.execute(stmt).all()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        run_migrations(engine)
+
+        start = time.perf_counter()
+        seed_issues(engine, args.rows)
+        plant_rare_terms(engine)
+        print(f"Seeded and indexed {args.rows:,} issues in {time.perf_counter() - start:.1f}s")
+
+        with Session(engine) as session:
+            for q in QUERIES:
+                results[q] = {
+                    "like_ms": median_ms(session, like_statement(q, args.limit), args.repeat),
+                    "fts_ms": median_ms(session, search_statement(fts_match_query(q), args.limit), args.repeat),
+                }
+        engine.dispose()
+
+    print(f"\n{'query':<24}{'LIKE (ms)':>12}{'FTS5 (ms)':>12}{'speedup':>10}")
+    for q, r in results.items():
+        print(f"{q:<24}{r['like_ms']:>12.2f}{r['fts_ms']:>12.2f}{r['like_ms'] / r['fts_ms']:>9.1f}x")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"rows": args.rows, "limit": args.limit, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
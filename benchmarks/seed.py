@@ -0,0 +1,51 @@
+"""
+Synthetic issue data for benchmarks.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.api.models import Issue
+
+WORDS = (
+    "login crash timeout payment gateway dashboard slow upload error server "
+    "database cache nginx deploy memory leak api token session mobile search "
+    "report export email notification queue worker latency certificate dns"
+).split()
+TAGS = ["bug", "feature", "performance", "security", "ui", "backend", "urgent", "infra", "docs", "mobile"]
+PRIORITIES = ["low", "medium", "high"]
+STATUSES = ["open", "in_progress", "closed"]
+
+
+def synthetic_issues(count, seed=42, start=datetime(2024, 1, 1)):
+    """Yield `count` issue rows with a realistic spread of values"""
+    rng = random.Random(seed)
+    for i in range(count):
+        words = rng.sample(WORDS, 6)
+        created_at = start + timedelta(seconds=i * 30 + rng.randint(0, 29))
+        yield {
+            "title": " ".join(words[:3]).capitalize(),
+            "description": " ".join(rng.choices(WORDS, k=20)),
+            "priority": rng.choice(PRIORITIES),
+            "status": rng.choices(STATUSES, weights=[3, 2, 5])[0],
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            "root_cause_hint": " ".join(words[3:]),
+            "estimated_minutes": rng.choice([None, 15, 30, 60, 120, 240]),
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(minutes=rng.randint(0, 60 * 24 * 7)),
+        }
+
+
+def seed_issues(engine, count, chunk_size=10_000, seed=42):
+    """Bulk insert `count` synthetic issues in chunked transactions"""
+    chunk = []
+    for row in synthetic_issues(count, seed=seed):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            with engine.begin() as conn:
+                conn.execute(insert(Issue.__table__), chunk)
+            chunk = []
+    if chunk:
+        with engine.begin() as conn:
+            conn.execute(insert(Issue.__table__), chunk)
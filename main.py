@@ -1,9 +1,15 @@
 from fastapi import FastAPI
+from app import config
 from app.api.routes.issues import router as issues_router
+from app.api.routes.metrics import router as metrics_router
+from app.api.routes.admin import router as admin_router
 from app.api.middleware.timer import timing_middleware
+from app.api.middleware.profiler import profiler_middleware
 from fastapi.middleware.cors import CORSMiddleware
 app = FastAPI()
 
+# Registered first so it runs inside timing_middleware and the timings include profiler overhead
+app.middleware("http")(profiler_middleware)
 app.middleware("http")(timing_middleware)
 
 app.add_middleware(
@@ -12,5 +18,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "ETag", "X-Cache", "Server-Timing", "X-Profile-Id", "X-Event-Offset"],
 )
-app.include_router(issues_router)
\ No newline at end of file
+if config.DB_ASYNC and config.ISSUE_BACKEND == "sqlalchemy":
+    # Registered first so the async CRUD handlers win over the sync ones for the same paths
+    from app.api.routes.issues_async import router as async_issues_router
+    app.include_router(async_issues_router)
+app.include_router(issues_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
\ No newline at end of file
@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway database first
+_tmp = tempfile.mkdtemp(prefix="issue-tracker-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ.setdefault("SEMANTIC_CACHE_ENABLED", "false")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.api.Database import SessionLocal, init_db
+from app.api.models import Issue
+
+
+@pytest.fixture
+def db():
+    """Migrated test database, emptied after each test"""
+    init_db()
+    session = SessionLocal()
+    yield session
+    session.execute(delete(Issue))
+    session.commit()
+    session.close()
+
+
+@pytest.fixture(params=["sync", "async"])
+def client(request, db):
+    """The issue routes as main.py mounts them, with and without DB_ASYNC"""
+    from app.api.routes.issues import router as issues_router
+    app = FastAPI()
+    if request.param == "async":
+        from app.api.routes.issues_async import router as async_issues_router
+        app.include_router(async_issues_router)
+    app.include_router(issues_router)
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,43 @@
+import pytest
+
+from app.api.events import EventBus, OffsetExpired
+from app.api.repository import SqlAlchemyIssueRepository
+from app.api.schemas import IssueCreate
+
+
+def test_list_reports_event_offset(client, db):
+    SqlAlchemyIssueRepository(db).create(IssueCreate(title="Crash", description="On login"))
+
+    response = client.get("/api/issues/issues")
+    assert response.status_code == 200
+    offset = response.headers["X-Event-Offset"]
+
+    # Also on 304s and cached pages
+    cached = client.get("/api/issues/issues")
+    assert cached.headers["X-Event-Offset"] == offset
+    not_modified = client.get("/api/issues/issues", headers={"If-None-Match": response.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["X-Event-Offset"] == offset
+
+    assert client.get("/api/issues/events/since", params={"after": offset}).status_code == 200
+
+
+def test_tokens_resume_and_expire():
+    bus = EventBus(size=2)
+    start = bus.parse_token(bus.token())
+    bus.publish("deleted", 1)
+    assert [e["issue_id"] for e in bus.since(start)] == [1]
+
+    bus.publish("deleted", 2)
+    bus.publish("deleted", 3)
+    with pytest.raises(OffsetExpired):
+        bus.since(start)
+    with pytest.raises(OffsetExpired):
+        bus.parse_token("another-epoch:1")
+    with pytest.raises(ValueError):
+        bus.parse_token("garbage")
+
+
+def test_since_rejects_expired_tokens(client):
+    assert client.get("/api/issues/events/since", params={"after": "another-epoch:0"}).status_code == 410
+    assert client.get("/api/issues/events/since", params={"after": "garbage"}).status_code == 400
@@ -0,0 +1,32 @@
+import pytest
+
+from app.agent.fast_path import parse_update_command
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("mark issue 7 as closed", {"issue_id": 7, "status": "closed"}),
+    ("change priority of #12 from medium to high", {"issue_id": 12, "priority": "high"}),
+    ("set tags of issue 3 to bug, urgent", {"issue_id": 3, "tags": ["bug", "urgent"]}),
+    ("issue 3 with tags bug and ui", {"issue_id": 3, "tags": ["bug", "ui"]}),
+    ("set status of issue 5 to closed and priority to high",
+     {"issue_id": 5, "status": "closed", "priority": "high"}),
+    ("reopen ticket-4", {"issue_id": 4, "status": "open"}),
+])
+def test_parses_structured_commands(query, expected):
+    assert parse_update_command(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    # Another clause after the tag list
+    "set tags of issue 3 to bug and close it",
+    "issue 3 with tags bug then close it",
+    "set tags of issue 3 to bug and priority to high",
+    # Slot keyword with a value of the other slot
+    "update issue 5 status to low",
+    "update issue 5 priority to closed",
+    # Needs the LLM
+    "rename issue 5 to login crash",
+    "close issue 3 and 4",
+])
+def test_falls_back_to_agent(query):
+    assert parse_update_command(query) is None
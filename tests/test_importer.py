@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.api import importer
+from app.api.Database import engine
+from app.api.importer import ImportFormat, import_issues, iter_json_array
+from app.api.models import Issue
+
+VALUES = [1, 12345, -3.25, 2.5e10, 1e-7, "text", True, None, {"a": [1, 2]}, [0.5]]
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 1 << 16])
+def test_json_array_across_read_boundaries(monkeypatch, read_size):
+    monkeypatch.setattr(importer, "_READ_SIZE", read_size)
+    for text in (json.dumps(VALUES), json.dumps(VALUES, indent=2), "[ 12345 ]", "[]"):
+        assert list(iter_json_array(io.StringIO(text))) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["{}", "[1 2]", "[2.x]", "[1,"])
+def test_json_array_rejects_malformed_input(monkeypatch, text):
+    monkeypatch.setattr(importer, "_READ_SIZE", 2)
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text)))
+
+
+def imported(db):
+    return {issue.title: issue for issue in db.scalars(select(Issue))}
+
+
+def test_import_json_with_rejects(db):
+    records = [
+        {"title": "ok", "tags": ["bug"], "issue_id": 999},
+        {"title": ""},
+        "not an object",
+        {"title": "dated", "created_at": "2020-01-01T00:00:00"},
+    ]
+    rejected = []
+    report = import_issues(engine, io.StringIO(json.dumps(records)), ImportFormat.json, chunk_size=1,
+                           on_reject=lambda number, record, error: rejected.append(number))
+
+    assert (report.read, report.imported, report.rejected) == (4, 2, 2)
+    assert [reject.record for reject in report.rejects] == rejected == [2, 3]
+    assert "title" in report.rejects[0].error
+
+    rows = imported(db)
+    assert set(rows) == {"ok", "dated"}
+    # Incoming ids are ignored; legacy timestamps are kept
+    assert rows["ok"].issue_id != 999
+    assert rows["dated"].created_at.year == rows["dated"].updated_at.year == 2020
+
+
+def test_import_ndjson_keeps_going_after_bad_lines(db):
+    text = '{"title": "a"}\n\nnot json\n{"title": "b", "priority": "urgent"}\n{"title": "c"}\n'
+    report = import_issues(engine, io.StringIO(text), ImportFormat.ndjson)
+    assert (report.read, report.imported, report.rejected) == (4, 2, 2)
+    assert report.rejects[0].error.startswith("Invalid JSON")
+    assert set(imported(db)) == {"a", "c"}
+
+
+def test_import_csv(db):
+    text = "title,priority,tags,estimated_minutes\nCrash,high,bug;auth,30\nEmpty cells,,,\n"
+    report = import_issues(engine, io.StringIO(text), ImportFormat.csv)
+    assert report.imported == 2
+    rows = imported(db)
+    assert rows["Crash"].tags == ["bug", "auth"]
+    assert rows["Crash"].estimated_minutes == 30
+    assert rows["Empty cells"].priority == "medium"
@@ -0,0 +1,52 @@
+from sqlalchemy import select
+
+from app.api.Database import engine
+from app.api.migrations import MIGRATIONS, applied_versions, run_migrations
+from app.api.models import IssueTag
+from app.api.repository import SqlAlchemyIssueRepository
+from app.api.schemas import IssueCreate
+from app.api.stats import _counter_rows, _group_by_rows, compute_stats
+
+
+def test_migrations_apply_once(db):
+    assert run_migrations(engine) == []
+    with engine.connect() as conn:
+        assert applied_versions(conn) == set(MIGRATIONS)
+
+
+def counters(db):
+    return sorted(tuple(row) for row in _counter_rows(db, 50))
+
+
+def group_by(db):
+    # What the triggers must agree with; tag rows carry no minutes in either
+    return sorted(tuple(row) for row in _group_by_rows(db, 50))
+
+
+def test_counters_follow_writes(db):
+    repo = SqlAlchemyIssueRepository(db)
+    a = repo.create(IssueCreate(title="a", priority="high", tags=["bug", "auth"], estimated_minutes=30))
+    b = repo.create(IssueCreate(title="b", status="closed", tags=["bug"], estimated_minutes=15))
+    repo.create_many([IssueCreate(title="c", tags=["ui"]), IssueCreate(title="d", estimated_minutes=5)])
+    assert counters(db) == group_by(db)
+
+    repo.update(a.issue_id, {"status": "in_progress", "estimated_minutes": 60, "tags": ["auth", "ui"]})
+    repo.update_many([a.issue_id, b.issue_id], {"priority": "low"})
+    repo.delete(b.issue_id)
+    assert counters(db) == group_by(db)
+
+    stats = compute_stats(db)
+    assert stats.total == 3
+    assert stats.by_status == {"in_progress": 1, "open": 2}
+    assert stats.by_tag == {"auth": 1, "ui": 2}
+    assert stats.estimated_minutes_total == 65
+    assert sum(stats.open_age.values()) == 3
+
+
+def test_issue_tags_follow_tags_column(db):
+    repo = SqlAlchemyIssueRepository(db)
+    issue = repo.create(IssueCreate(title="a", tags=["bug", "auth"]))
+    repo.update(issue.issue_id, {"tags": ["ui"]})
+    assert db.scalars(select(IssueTag.tag).where(IssueTag.issue_id == issue.issue_id)).all() == ["ui"]
+    repo.delete(issue.issue_id)
+    assert db.scalars(select(IssueTag.tag).where(IssueTag.issue_id == issue.issue_id)).all() == []
@@ -0,0 +1,61 @@
+from app.api.repository import SqlAlchemyIssueRepository
+from app.api.schemas import IssueCreate
+
+API = "/api/issues"
+
+
+def create(db, title="Crash"):
+    return SqlAlchemyIssueRepository(db).create(IssueCreate(title=title, description="On login"))
+
+
+def test_get_etag_and_304(client, db):
+    issue = create(db)
+    response = client.get(f"{API}/issue/{issue.issue_id}")
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert client.get(f"{API}/issue/{issue.issue_id}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_patch_if_match(client, db):
+    issue = create(db)
+    etag = client.get(f"{API}/issue/{issue.issue_id}").headers["ETag"]
+
+    response = client.patch(f"{API}/issues/{issue.issue_id}", json={"status": "closed"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["status"] == "closed"
+    assert response.headers["ETag"] != etag
+
+    # The old version no longer matches, and a failed PATCH leaves the issue untouched
+    stale = client.patch(f"{API}/issues/{issue.issue_id}", json={"status": "open"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    weak = client.patch(f"{API}/issues/{issue.issue_id}", json={"status": "open"},
+                        headers={"If-Match": "W/" + response.headers["ETag"]})
+    assert weak.status_code == 412
+    assert client.get(f"{API}/issue/{issue.issue_id}").json()["status"] == "closed"
+
+    assert client.patch(f"{API}/issues/{issue.issue_id}", json={"priority": "high"},
+                        headers={"If-Match": "*"}).status_code == 200
+    assert client.patch(f"{API}/issues/0", json={"priority": "high"}, headers={"If-Match": etag}).status_code == 404
+
+
+def test_patch_validation(client, db):
+    issue = create(db)
+    assert client.patch(f"{API}/issues/{issue.issue_id}", json={}).status_code == 400
+    assert client.patch(f"{API}/issues/{issue.issue_id}", json={"title": None}).status_code == 422
+
+
+def test_bulk_patch(client, db):
+    ids = [create(db, f"Issue {n}").issue_id for n in range(3)]
+    response = client.patch(f"{API}/issues", json={"ids": ids + [0, ids[0]], "changes": {"status": "in_progress"}})
+    body = response.json()
+    assert response.status_code == 200
+    assert body["updated"] == 3
+    assert body["missing"] == [0]
+    assert {issue["status"] for issue in body["issues"]} == {"in_progress"}
+
+
+def test_delete(client, db):
+    issue = create(db)
+    assert client.delete(f"{API}/issues/{issue.issue_id}").status_code == 204
+    assert client.delete(f"{API}/issues/{issue.issue_id}").status_code == 404
+    assert client.get(f"{API}/issue/{issue.issue_id}").status_code == 404
@@ -0,0 +1,109 @@
+import pytest
+
+from app.api.queries import IssueSort, SortOrder, encode_cursor
+from app.api.repository import (
+    FileIssueRepository, InMemoryIssueRepository, SqlAlchemyIssueRepository, VersionConflict
+)
+from app.api.schemas import IssueCreate, IssueFilters, TagMode
+from app.api.storage import LogStore
+
+ISSUES = [
+    IssueCreate(title="Login crash", priority="high", status="open", tags=["bug", "auth"]),
+    IssueCreate(title="Slow search", priority="medium", status="in_progress", tags=["perf"]),
+    IssueCreate(title="Typo on home page", priority="low", status="closed", tags=["ui"]),
+    IssueCreate(title="Token expiry", priority="high", status="closed", tags=["bug", "auth", "ui"]),
+    IssueCreate(title="Dark mode", priority="low", status="open", tags=[]),
+]
+
+
+@pytest.fixture(params=["sqlalchemy", "memory", "file"])
+def repo(request, tmp_path):
+    if request.param == "sqlalchemy":
+        yield SqlAlchemyIssueRepository(request.getfixturevalue("db"))
+    elif request.param == "memory":
+        yield InMemoryIssueRepository()
+    else:
+        # Small compact_every so the tests also run through compaction
+        repo = FileIssueRepository(LogStore(tmp_path, compact_every=3, fsync=False))
+        yield repo
+        repo.close()
+
+
+def test_create_get_delete(repo):
+    created = repo.create(ISSUES[0])
+    assert created.title == "Login crash"
+    assert created.tags == ["bug", "auth"]
+    assert repo.get(created.issue_id) == created
+    assert repo.count() == 1
+
+    assert repo.delete(created.issue_id)
+    assert not repo.delete(created.issue_id)
+    assert repo.get(created.issue_id) is None
+
+
+def test_create_many_keeps_order(repo):
+    created = repo.create_many(ISSUES)
+    assert [issue.title for issue in created] == [issue.title for issue in ISSUES]
+    assert len({issue.issue_id for issue in created}) == len(ISSUES)
+
+
+def test_update(repo):
+    created = repo.create(ISSUES[0])
+    updated = repo.update(created.issue_id, {"status": "closed", "tags": ["bug"]})
+    assert updated.status == "closed"
+    assert updated.tags == ["bug"]
+    assert updated.title == created.title
+    assert updated.updated_at >= created.updated_at
+    assert repo.get(created.issue_id) == updated
+    assert repo.update(0, {"status": "closed"}) is None
+
+
+def test_update_expected_version(repo):
+    created = repo.create(ISSUES[0])
+    updated = repo.update(created.issue_id, {"priority": "low"}, expected=[created.updated_at])
+    assert updated.priority == "low"
+
+    with pytest.raises(VersionConflict):
+        repo.update(created.issue_id, {"priority": "high"}, expected=[created.updated_at])
+    with pytest.raises(VersionConflict):
+        repo.update(created.issue_id, {"priority": "high"}, expected=[])
+    assert repo.get(created.issue_id).priority == "low"
+    assert repo.update(0, {"priority": "high"}, expected=[created.updated_at]) is None
+
+
+def test_update_many(repo):
+    ids = [issue.issue_id for issue in repo.create_many(ISSUES[:3])]
+    updated = repo.update_many(ids[:2] + [0], {"status": "closed"})
+    assert sorted(issue.issue_id for issue in updated) == ids[:2]
+    assert [repo.get(i).status for i in ids] == ["closed", "closed", "closed"]
+    assert repo.update_many([], {"status": "open"}) == []
+
+
+@pytest.mark.parametrize("filters, titles", [
+    (IssueFilters(), [issue.title for issue in ISSUES]),
+    (IssueFilters(status=["closed"]), ["Typo on home page", "Token expiry"]),
+    (IssueFilters(priority=["high"], status=["open"]), ["Login crash"]),
+    (IssueFilters(tags=["auth", "ui"]), ["Login crash", "Typo on home page", "Token expiry"]),
+    (IssueFilters(tags=["auth", "ui"], tag_mode=TagMode.all), ["Token expiry"]),
+])
+def test_list_filters(repo, filters, titles):
+    repo.create_many(ISSUES)
+    assert [issue.title for issue in repo.list(filters)] == titles
+
+
+@pytest.mark.parametrize("sort", list(IssueSort))
+@pytest.mark.parametrize("order", list(SortOrder))
+def test_list_cursor_pages(repo, sort, order):
+    repo.create_many(ISSUES)
+    everything = repo.list(IssueFilters(), sort, order)
+    assert len(everything) == len(ISSUES)
+
+    pages, cursor = [], None
+    while True:
+        page = repo.list(IssueFilters(), sort, order, limit=2, cursor=cursor)
+        pages += page
+        if len(page) < 2:
+            break
+        cursor = encode_cursor(page[-1], sort, order)
+    assert pages == everything
+    assert repo.list(IssueFilters(), sort, order, limit=2, skip=2) == everything[2:4]
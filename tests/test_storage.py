@@ -0,0 +1,110 @@
+import json
+
+from app.api.repository import FileIssueRepository
+from app.api.schemas import IssueCreate
+from app.api.storage import LogStore
+
+
+def open_store(path, compact_every=100):
+    store = LogStore(path, compact_every=compact_every, fsync=False)
+    records = store.load()
+    return store, records
+
+
+def test_put_delete_reload(tmp_path):
+    store, records = open_store(tmp_path)
+    assert records == {}
+    store.put({"issue_id": 1, "title": "a"})
+    store.put({"issue_id": 2, "title": "b"})
+    store.put({"issue_id": 1, "title": "a2"})
+    store.delete(2)
+    store.close()
+
+    store, records = open_store(tmp_path)
+    assert records == {1: {"issue_id": 1, "title": "a2"}}
+    assert store.seq == 4
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    store, _ = open_store(tmp_path)
+    store.put({"issue_id": 1, "title": "a"})
+    store.close()
+    with open(tmp_path / "issues.log", "ab") as f:
+        f.write(b'{"seq":2,"op":"put","record":{"issue_id":2,')
+
+    store, records = open_store(tmp_path)
+    assert list(records) == [1]
+    # The torn bytes are gone, so the next append starts on a clean line
+    store.put({"issue_id": 3, "title": "c"})
+    store.close()
+    store, records = open_store(tmp_path)
+    assert list(records) == [1, 3]
+    store.close()
+
+
+def test_compaction(tmp_path):
+    store, _ = open_store(tmp_path, compact_every=2)
+    store.put({"issue_id": 1, "title": "a"})
+    store.put({"issue_id": 2, "title": "b"})
+    assert store.needs_compaction()
+    store.compact([{"issue_id": 1, "title": "a"}, {"issue_id": 2, "title": "b"}])
+    assert (tmp_path / "issues.log").read_bytes() == b""
+    store.delete(1)
+    store.close()
+
+    store, records = open_store(tmp_path, compact_every=2)
+    assert records == {2: {"issue_id": 2, "title": "b"}}
+    assert store.seq == 3
+    assert store.log_entries == 1
+    store.close()
+
+
+def test_crash_between_snapshot_and_log_truncation(tmp_path):
+    store, _ = open_store(tmp_path)
+    store.put({"issue_id": 1, "title": "a"})
+    store.delete(1)
+    store.put({"issue_id": 2, "title": "b"})
+    old_log = (tmp_path / "issues.log").read_bytes()
+    store.compact([{"issue_id": 2, "title": "b"}])
+    store.close()
+    # The snapshot was renamed into place but the log was never truncated
+    (tmp_path / "issues.log").write_bytes(old_log)
+
+    store, records = open_store(tmp_path)
+    assert records == {2: {"issue_id": 2, "title": "b"}}
+    store.put({"issue_id": 3, "title": "c"})
+    assert store.seq == 4
+    store.close()
+
+
+def test_legacy_import_keeps_timestamps(tmp_path):
+    (tmp_path / "issues.json").write_text(json.dumps([
+        {"title": "old", "description": "d"},
+        {"title": "dated", "created_at": "2020-01-01T00:00:00"},
+    ]))
+    repo = FileIssueRepository(LogStore(tmp_path, fsync=False))
+    first = {issue.issue_id: issue for issue in repo._issues.values()}
+    repo.close()
+    assert (tmp_path / "issues.snapshot").exists()
+    assert first[2].created_at.year == 2020
+    assert first[2].updated_at == first[2].created_at
+
+    repo = FileIssueRepository(LogStore(tmp_path, fsync=False))
+    assert {issue.issue_id: issue for issue in repo._issues.values()} == first
+    repo.close()
+
+
+def test_file_repository_survives_reopen(tmp_path):
+    repo = FileIssueRepository(LogStore(tmp_path, compact_every=2, fsync=False))
+    a = repo.create(IssueCreate(title="a", tags=["bug"]))
+    b = repo.create(IssueCreate(title="b"))
+    repo.update(a.issue_id, {"status": "closed"})
+    repo.delete(b.issue_id)
+    expected = {issue.issue_id: issue for issue in repo._issues.values()}
+    repo.close()
+
+    reopened = FileIssueRepository(LogStore(tmp_path, compact_every=2, fsync=False))
+    assert {issue.issue_id: issue for issue in reopened._issues.values()} == expected
+    assert reopened.get(a.issue_id).status == "closed"
+    assert reopened.get(b.issue_id) is None
+    reopened.close()